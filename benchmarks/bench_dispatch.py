@@ -0,0 +1,31 @@
+"""Micro-benchmark of the dispatch of nodes to simplification rules.
+
+Reports the average time per node of simplifying real-world modules (dominated by nodes that no rule changes, such as
+names bound to nothing and function bodies) and of visiting a list of leaf nodes that no rule applies to.
+
+Usage: poetry run python benchmarks/bench_dispatch.py
+"""
+
+import ast
+import timeit
+
+from simplify.simplifier import Simplifier
+from workloads import STDLIB_MODULES, stdlib_module
+
+
+def main():
+    print(f"{'workload':<24} {'nodes':>8} {'per node (ns)':>14}")
+    for name in STDLIB_MODULES:
+        tree = ast.parse(stdlib_module(name))
+        nodes = sum(1 for _ in ast.walk(tree))
+        seconds = min(timeit.repeat(lambda: Simplifier().visit(tree), number=1, repeat=10))
+        print(f"{'stdlib_' + name:<24} {nodes:>8} {seconds / nodes * 1e9:>14.0f}")
+
+    leaves = [ast.Pass() for _ in range(100_000)]
+    simp = Simplifier()
+    seconds = min(timeit.repeat(lambda: simp.visit(leaves), number=1, repeat=10))
+    print(f"{'leaves':<24} {len(leaves):>8} {seconds / len(leaves) * 1e9:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the time taken to import the library interface of simplify.
+
+Embedding simplify through `simplify.api` should not pay for the command line interface: importing it must not load
+`typer`, `inspect`, `importlib` or `tracemalloc`, and should stay within a time budget.
+
+Usage:
+    poetry run python benchmarks/bench_import.py
+    poetry run python benchmarks/bench_import.py --budget-ms 100   # exits with status 1 if over budget
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Set, Tuple
+
+# modules that only the command line interface (or `--module`) may load
+CLI_ONLY_MODULES = ("typer", "inspect", "importlib", "tracemalloc")
+
+
+def import_time(module: str) -> Tuple[float, Set[str]]:
+    # cumulative import time of `module` in microseconds, as reported by `-X importtime`, and the modules it loaded
+    code = f"import sys; before = set(sys.modules); import {module}; print(*sorted(set(sys.modules) - before))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # lines have the form `import time: <self> | <cumulative> | <indented module name>`
+        _, cumulative_us, name = line.split("|")
+        if name.strip() == module:
+            return float(cumulative_us), set(result.stdout.split())
+    raise RuntimeError(f"No import time reported for {module}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Maximum median import time of simplify.api.")
+    args = parser.parse_args()
+
+    status = 0
+    print(f"{'module':<14} {'median (ms)':>12} {'best (ms)':>10}")
+    for module in ("simplify.api", "simplify.main"):
+        runs = [import_time(module) for _ in range(args.repeat)]
+        times = [t / 1e3 for t, _ in runs]
+        median = statistics.median(times)
+        print(f"{module:<14} {median:>12.1f} {min(times):>10.1f}")
+        if module == "simplify.api":
+            loaded = sorted(set(CLI_ONLY_MODULES) & runs[0][1])
+            if loaded:
+                print(f"simplify.api loads {', '.join(loaded)}.", file=sys.stderr)
+                status = 1
+            if args.budget_ms is not None and median > args.budget_ms:
+                print(f"simplify.api took {median:.1f} ms to import (budget: {args.budget_ms} ms).", file=sys.stderr)
+                status = 1
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Micro-benchmark of name resolution in `Scope`.
+
+Lookups of a name bound in the global scope should cost the same regardless of how deeply the looking-up scope is
+nested, and inlining deeply nested lambdas should scale linearly in the number of names resolved. Constant bindings are
+stored compactly, so binding many constants should allocate far less than one AST node per binding.
+
+Usage: poetry run python benchmarks/bench_scope.py
+"""
+
+import ast
+import timeit
+import tracemalloc
+
+from simplify.main import transform_source
+from simplify.scope import Scope
+
+
+def nested_scopes(depth: int) -> Scope:
+    global_scope = Scope()
+    global_scope["x"] = ast.Constant(0)
+    scope = global_scope
+    for i in range(depth):
+        scope = Scope(global_scope, scope)
+        scope[f"y{i}"] = ast.Constant(i)
+    return scope
+
+
+def nested_lambdas(depth: int) -> str:
+    # the innermost body refers to the parameter of every enclosing lambda
+    source = " + ".join(f"x{i}" for i in range(depth))
+    for i in reversed(range(depth)):
+        source = f"(lambda x{i}: {source})({i})"
+    return source
+
+
+def bind_constants(n: int) -> int:
+    # bytes retained by a scope binding `n` parsed constants (with source positions, as produced by `ast.parse`) once
+    # the parsed nodes themselves are no longer referenced
+    names = [f"x{i}" for i in range(n)]
+    tracemalloc.start()
+    scope = Scope()
+    for i, name in enumerate(names):
+        scope[name] = ast.Constant(i + 1000, lineno=1, col_offset=0, end_lineno=1, end_col_offset=4)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    number = 100_000
+    print(f"{'depth':>6} {'lookup (ns)':>12}")
+    for depth in (1, 10, 100, 1000):
+        scope = nested_scopes(depth)
+        seconds = timeit.timeit(lambda: scope.get("x"), number=number)
+        print(f"{depth:>6} {seconds / number * 1e9:>12.0f}")
+
+    print()
+    print(f"{'depth':>6} {'inline (ms)':>12}")
+    for depth in (10, 25, 50):
+        source = nested_lambdas(depth)
+        seconds = min(timeit.repeat(lambda: transform_source(source), number=1, repeat=5))
+        print(f"{depth:>6} {seconds * 1e3:>12.2f}")
+
+    print()
+    print(f"{'bindings':>8} {'bytes/binding':>14}")
+    for n in (1000, 10_000, 100_000):
+        print(f"{n:>8} {bind_constants(n) / n:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark `transform_source` on generated and real-world workloads.
+
+Usage:
+    poetry run python benchmarks/run.py                            # print results
+    poetry run python benchmarks/run.py --save benchmarks/baseline.json
+    poetry run python benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.2
+
+Each workload reports the best wall-clock time over several repeats, the resulting throughput and the peak memory
+traced while simplifying it once. Comparing against a baseline exits with status 1 if any workload got slower (or
+used more memory) by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict
+
+from workloads import all_workloads
+
+from simplify.main import transform_source
+
+
+def measure(source: str, repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transform_source(source)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    # The first traced run may allocate memory that the interpreter keeps for later runs (e.g. buffers of the parser,
+    # depending on the workloads run before), so the lowest peak of two runs is kept.
+    peaks = []
+    for _ in range(2):
+        tracemalloc.start()
+        try:
+            transform_source(source)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    peak = min(peaks)
+    return {"time": best, "throughput": len(source) / best, "peak_memory": peak}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    ok = True
+    print(f"\n{'workload':<24} {'time':>8} {'memory':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        time_ratio = result["time"] / baseline[name]["time"]
+        memory_ratio = result["peak_memory"] / baseline[name]["peak_memory"]
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        ok = ok and not regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<24} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run workloads whose name contains this string.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed runs per workload.")
+    parser.add_argument("--save", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Compare results against this JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown tolerated by --compare.")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'workload':<24} {'time (ms)':>10} {'KB/s':>10} {'peak (KB)':>10}")
+    for name, make_source in all_workloads().items():
+        if args.filter not in name:
+            continue
+        try:
+            result = measure(make_source(), args.repeat)
+        except Exception as e:
+            print(f"{name:<24} failed: {type(e).__name__}: {e}")
+            continue
+        results[name] = result
+        print(
+            f"{name:<24} {result['time'] * 1e3:>10.2f} {result['throughput'] / 1e3:>10.1f} "
+            f"{result['peak_memory'] / 1e3:>10.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
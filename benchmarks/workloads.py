@@ -0,0 +1,47 @@
+import sysconfig
+from pathlib import Path
+from typing import Callable, Dict
+
+STDLIB_MODULES = ("textwrap", "colorsys", "string", "heapq", "shlex", "calendar", "base64", "pprint")
+
+
+def bin_op_chain(n: int) -> str:
+    # alternating names and constants keep the chain from being folded away immediately
+    return " + ".join(f"x{i} * {i}" if i % 2 else str(i) for i in range(n))
+
+
+def constant_chain(n: int) -> str:
+    return " + ".join(map(str, range(n)))
+
+
+def bool_op(n: int) -> str:
+    return " and ".join(f"x{i}" if i % 2 else "True" for i in range(n))
+
+
+def for_loop(n: int) -> str:
+    elements = ", ".join(map(str, range(n)))
+    return f"acc = 0\nfor i in [{elements}]:\n    acc += i * 2\n    print(i, acc)\n"
+
+
+def nested_lambdas(depth: int) -> str:
+    source = " + ".join(f"x{i}" for i in range(depth))
+    for i in reversed(range(depth)):
+        source = f"(lambda x{i}: {source})({i})"
+    return source
+
+
+def stdlib_module(name: str) -> str:
+    return (Path(sysconfig.get_paths()["stdlib"]) / f"{name}.py").read_text()
+
+
+def all_workloads() -> Dict[str, Callable[[], str]]:
+    workloads = {
+        "bin_op_chain_100": lambda: bin_op_chain(100),
+        "constant_chain_100": lambda: constant_chain(100),
+        "bool_op_2000": lambda: bool_op(2000),
+        "for_loop_2000": lambda: for_loop(2000),
+        "nested_lambdas_50": lambda: nested_lambdas(50),
+    }
+    for name in STDLIB_MODULES:
+        workloads[f"stdlib_{name}"] = lambda name=name: stdlib_module(name)
+    return workloads
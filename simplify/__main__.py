@@ -1,7 +1,13 @@
 #!/usr/bin/scope python3
+import sys
+
 import typer
 
-from simplify.main import main
+from simplify.main import main, serve
 
 if __name__ == "__main__":
-    typer.run(main)
+    if sys.argv[1:2] == ["serve"]:
+        del sys.argv[1]
+        typer.run(serve)
+    else:
+        typer.run(main)
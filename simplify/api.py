@@ -0,0 +1,111 @@
+import ast
+import os
+from typing import TYPE_CHECKING, List, Optional, Union
+
+from simplify.fixed_point import simplify_to_fixed_point
+from simplify.liveness import eliminate_dead_code
+from simplify.options import Options
+from simplify.utils import parse_bindings, recursion_limit
+
+if TYPE_CHECKING:
+    from simplify.cache import MemoryCache, ResultCache
+    from simplify.incremental import IncrementalSession
+    from simplify.modules import ModuleResolver
+    from simplify.profiling import Profiler
+
+# Library interface. Importing this module only loads the simplifier and its rules, not the dependencies of the command
+# line interface (`typer`) or of loading objects by Python path (`importlib` and `inspect`), so that it is cheap to
+# embed (see `benchmarks/bench_import.py`).
+
+__all__ = ["Options", "transform_file", "transform_source", "transform_tree"]
+
+# recursion limit of `ast.parse` and `ast.unparse` in iterative mode (higher limits risk overflowing the C stack)
+DEEP_RECURSION_LIMIT = 100_000
+
+
+def _simplify(
+    tree: ast.Module,
+    bindings: dict,
+    options: Options,
+    stats: Optional[dict],
+    profiler: Optional["Profiler"],
+    session: Optional["IncrementalSession"],
+    resolver: Optional["ModuleResolver"],
+) -> ast.Module:
+    if session is not None:
+        result = session.simplify(tree)
+    else:
+        result = simplify_to_fixed_point(tree, bindings, options, profiler, resolver)
+    tree = result.tree
+    if options.eliminate_dead_code:
+        tree = eliminate_dead_code(tree)
+    if stats is not None:
+        stats.update(passes=result.passes, converged=result.converged)
+    return tree
+
+
+def transform_tree(
+    tree: ast.Module,
+    bind_list: Optional[List[str]] = None,
+    options: Optional[Options] = None,
+    stats: Optional[dict] = None,
+    profiler: Optional["Profiler"] = None,
+    session: Optional["IncrementalSession"] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> ast.Module:
+    if options is None:
+        options = Options()
+    return _simplify(tree, parse_bindings(bind_list or []), options, stats, profiler, session, resolver)
+
+
+def transform_source(
+    source: str,
+    bind_list: Optional[List[str]] = None,
+    cache: Optional[Union["ResultCache", "MemoryCache"]] = None,
+    options: Optional[Options] = None,
+    stats: Optional[dict] = None,
+    profiler: Optional["Profiler"] = None,
+    session: Optional["IncrementalSession"] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> str:
+    if bind_list is None:
+        bind_list = []
+    if options is None:
+        options = Options()
+    bindings = parse_bindings(bind_list)
+    tree = None
+    if cache is not None:
+        dependencies = ""
+        if resolver is not None:
+            # the result also depends on the modules imported by the source, which are only known once it is parsed
+            with recursion_limit(DEEP_RECURSION_LIMIT if options.iterative else 0):
+                tree = ast.parse(source)
+            dependencies = resolver.fingerprint(tree)
+        key = cache.key(source, bindings, options, dependencies)
+        text = cache.get(key)
+        if text is not None:
+            return text
+    if tree is None:
+        with recursion_limit(DEEP_RECURSION_LIMIT if options.iterative else 0):
+            tree = ast.parse(source)
+    tree = _simplify(tree, bindings, options, stats, profiler, session, resolver)
+    with recursion_limit(DEEP_RECURSION_LIMIT if options.iterative else 0):
+        text = ast.unparse(ast.fix_missing_locations(tree))
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+
+def transform_file(
+    path: Union[str, os.PathLike],
+    bind_list: Optional[List[str]] = None,
+    cache: Optional[Union["ResultCache", "MemoryCache"]] = None,
+    options: Optional[Options] = None,
+    stats: Optional[dict] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> str:
+    with open(path) as f:
+        source = f.read()
+    # relative imports are resolved from the location of the file
+    resolver = None if resolver is None else resolver.with_importer(path)
+    return transform_source(source, bind_list, cache, options, stats, resolver=resolver)
@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from simplify.cache import ResultCache
+from simplify.api import transform_source
+from simplify.options import Options
+
+if TYPE_CHECKING:
+    from simplify.modules import ModuleResolver
+
+
+class FileResult(NamedTuple):
+    path: str
+    output_path: str
+    error: Optional[str] = None
+
+
+def find_source_files(root: str) -> List[Path]:
+    root_path = Path(root)
+    if root_path.is_file():
+        return [root_path]
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(root_path):
+        # prune hidden directories and byte-code caches in place so that os.walk does not descend into them
+        dir_names[:] = sorted(d for d in dir_names if not d.startswith(".") and d != "__pycache__")
+        paths.extend(Path(dir_path, f) for f in sorted(file_names) if f.endswith(".py"))
+    return paths
+
+
+def get_output_path(path: Path, root: str, output_dir: Optional[str]) -> Path:
+    if not output_dir:
+        return path
+    root_path = Path(root)
+    if root_path.is_file():
+        return Path(output_dir, path.name)
+    return Path(output_dir, path.relative_to(root_path))
+
+
+def simplify_file(
+    paths: Tuple[Path, Path],
+    bind_list: Optional[List[str]] = None,
+    cache: Optional[ResultCache] = None,
+    options: Optional[Options] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> FileResult:
+    path, output_path = paths
+    try:
+        source = path.read_text()
+        if resolver is not None:
+            resolver = resolver.with_importer(path)
+        result = transform_source(source, bind_list, cache, options, resolver=resolver) + "\n"
+        if output_path != path or result != source:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(result)
+    except Exception as e:  # report per-file failures instead of aborting the whole run
+        return FileResult(str(path), str(output_path), f"{type(e).__name__}: {e}")
+    return FileResult(str(path), str(output_path))
+
+
+def simplify_tree(
+    root: str,
+    output_dir: Optional[str] = None,
+    bind_list: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    options: Optional[Options] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> List[FileResult]:
+    paths = [(p, get_output_path(p, root, output_dir)) for p in find_source_files(root)]
+    # summaries of imported modules are shared by the files simplified in a process, and between processes on disk
+    work = partial(simplify_file, bind_list=bind_list, cache=cache, options=options, resolver=resolver)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        return list(map(work, paths))
+
+    if not chunk_size:
+        # a few chunks per worker amortizes inter-process overhead while still balancing uneven file sizes
+        chunk_size = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(work, paths, chunksize=chunk_size))
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from simplify import __version__
+from simplify.options import Options
+from simplify.rules import DEFAULT_RULES
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "simplify"
+DEFAULT_MAX_SIZE = 256 * 2**20  # bytes
+
+RULES = tuple(
+    sorted(f"{node_type.__name__}:{rule.__module__}.{rule.__name__}" for node_type, rule in DEFAULT_RULES.items())
+)
+
+
+# `dependencies` identifies the contents of the other modules the result depends on (see `ModuleResolver.fingerprint`).
+def cache_key(source: str, bindings: dict, options: Options = Options(), dependencies: str = "") -> str:
+    digest = hashlib.sha256()
+    parts = [__version__, ",".join(RULES), repr(options), repr(sorted(bindings.items())), source]
+    if dependencies:
+        parts.append(dependencies)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: os.PathLike = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    def key(self, source: str, bindings: dict, options: Options = Options(), dependencies: str = "") -> str:
+        return cache_key(source, bindings, options, dependencies)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # the modification time records the last use for LRU eviction
+        return text
+
+    def put(self, key: str, text: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so that concurrent readers never observe a partial entry
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by a concurrent run
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+
+# In-memory counterpart of `ResultCache` for long-running processes, safe to share between threads.
+class MemoryCache:
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def key(self, source: str, bindings: dict, options: Options = Options(), dependencies: str = "") -> str:
+        return cache_key(source, bindings, options, dependencies)
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
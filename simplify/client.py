@@ -0,0 +1,78 @@
+import itertools
+import json
+import socket
+import subprocess
+import sys
+from typing import IO, Any, List, Optional
+
+from simplify.options import Options
+
+
+class ServerError(Exception):
+    def __init__(self, error: dict):
+        super().__init__(f"{error['message']} (code {error['code']})")
+        self.code = error["code"]
+        self.data = error.get("data")
+
+
+# Thin client of the `python -m simplify serve` daemon, either spawned as a subprocess talking over its standard
+# streams or reached over a Unix socket.
+class Client:
+    def __init__(self, reader: IO[str], writer: IO[str], process: Optional[subprocess.Popen] = None):
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+        self.ids = itertools.count()
+
+    @classmethod
+    def spawn(cls) -> "Client":
+        process = subprocess.Popen(
+            [sys.executable, "-m", "simplify", "serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        return cls(process.stdout, process.stdin, process)
+
+    @classmethod
+    def connect(cls, socket_path: str) -> "Client":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+        stream = sock.makefile("rw", encoding="utf-8")
+        sock.close()  # the stream holds its own reference to the connection
+        return cls(stream, stream)
+
+    def call(self, method: str, **params: Any) -> Any:
+        request_id = next(self.ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        self.writer.write(json.dumps(request) + "\n")
+        self.writer.flush()
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection.")
+        response = json.loads(line)
+        if "error" in response:
+            raise ServerError(response["error"])
+        return response["result"]
+
+    def transform_source(
+        self, source: str, bind_list: Optional[List[str]] = None, options: Optional[Options] = None
+    ) -> str:
+        return self.call("transform_source", source=source, bind=bind_list, options=options and options._asdict())
+
+    def shutdown(self):
+        self.call("shutdown")
+        self.close()
+
+    def close(self):
+        self.writer.close()
+        if self.reader is not self.writer:
+            self.reader.close()
+        if self.process is not None:
+            self.process.wait()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
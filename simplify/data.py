@@ -1,4 +1,5 @@
 import ast
+import math
 import operator as op
 
 BIN_OPS = {
@@ -38,3 +39,36 @@ UNARY_OPS = {
     ast.Not: op.not_,
     ast.Invert: op.inv,
 }
+
+
+# Modules whose pure functions are evaluated when called with constant arguments, by the name they are imported as.
+PURE_MODULES = {"math": math, "operator": op}
+
+# Functions without side effects whose results only depend on their arguments, by the name they are called through.
+# Only builtins that return constants (e.g. not `list` or `range`) and are deterministic (e.g. not `hash` or `id`) are
+# included.
+PURE_FUNCTIONS = {
+    **{
+        fn.__name__: fn
+        for fn in (abs, all, any, ascii, bin, bool, chr, complex, divmod, float, hex, int, len, max, min, oct, ord, pow)
+    },
+    **{fn.__name__: fn for fn in (repr, round, str, sum, tuple)},
+    **{
+        f"math.{name}": getattr(math, name)
+        for name in (
+            "acos acosh asin asinh atan atan2 atanh ceil comb copysign cos cosh degrees dist erf erfc exp expm1 fabs "
+            "factorial floor fmod frexp fsum gamma gcd hypot isclose isfinite isinf isnan isqrt lcm ldexp lgamma log "
+            "log10 log1p log2 modf nextafter perm pow prod radians remainder sin sinh sqrt tan tanh trunc ulp"
+        ).split()
+    },
+    **{
+        f"operator.{name}": getattr(op, name)
+        for name in (
+            "abs add and_ concat contains countOf eq floordiv ge getitem gt index indexOf inv invert le lshift lt mod "
+            "mul ne neg not_ or_ pos pow rshift sub truediv truth xor"
+        ).split()
+    },
+}
+
+# pure functions that consume an iterable argument at once, so that it can be materialized into a tuple
+ITERABLE_CONSUMERS = (all, any, max, min, sum, tuple, math.fsum, math.prod)
@@ -10,6 +10,18 @@ class InvalidBindingError(Exception):
         super().__init__(message)
 
 
+class BudgetExceededError(Exception):
+    def __init__(self, message=""):
+        message = f"Budget exceeded. {message}"
+        super().__init__(message)
+
+
+class InvalidRuleError(Exception):
+    def __init__(self, rule: str):
+        message = f"Invalid rule: {rule}"
+        super().__init__(message)
+
+
 class InvalidExpressionError(Exception):
     def __init__(self, expr):
         message = f"Invalid expression: {expr}"
@@ -0,0 +1,71 @@
+import ast
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set
+
+from simplify.hashing import eq_nodes
+from simplify.options import Options
+from simplify.simplifier import Simplifier
+from simplify.utils import assigned_names, loaded_names
+
+if TYPE_CHECKING:
+    from simplify.modules import ModuleResolver
+    from simplify.profiling import Profiler
+
+
+class FixedPointResult(NamedTuple):
+    tree: ast.Module
+    passes: int
+    converged: bool
+
+
+def binds_names(stmt: ast.stmt) -> bool:
+    return bool(assigned_names([stmt])) or any(isinstance(n, (ast.Global, ast.Nonlocal)) for n in ast.walk(stmt))
+
+
+# Simplify `tree` repeatedly until it no longer changes, or until `options.max_passes` passes have been made.
+#
+# A top-level statement that did not change in a pass and binds no names is settled: the next pass reuses it as is,
+# unless it loads a name rebound by a statement that changed in that pass. Each pass starts from fresh bindings since
+# the assignments consumed by the previous pass have been removed from the tree.
+def simplify_to_fixed_point(
+    tree: ast.Module,
+    bindings: Optional[dict] = None,
+    options: Optional[Options] = None,
+    profiler: Optional["Profiler"] = None,
+    resolver: Optional["ModuleResolver"] = None,
+) -> FixedPointResult:
+    options = options or Options()
+    deadline = None if options.time_budget is None else time.monotonic() + options.time_budget
+    settled = [False] * len(tree.body)
+    loads: Dict[int, Set[str]] = {}
+
+    for passes in range(1, options.max_passes + 1):
+        simp = Simplifier(bindings, options, profiler, deadline, resolver=resolver)
+        simp.track_bindings(tree)
+        body: List[ast.stmt] = []
+        new_settled: List[bool] = []
+        dirty_names: Set[str] = set()
+        changed = False
+        for stmt, is_settled in zip(tree.body, settled):
+            if is_settled:
+                stmt_loads = loads.setdefault(id(stmt), loaded_names(stmt))
+                if not stmt_loads & dirty_names:
+                    body.append(stmt)
+                    new_settled.append(True)
+                    continue
+
+            result = simp.visit([stmt])
+            if len(result) == 1 and eq_nodes(result[0], stmt):
+                body.append(stmt)
+                new_settled.append(not binds_names(stmt))
+            else:
+                changed = True
+                dirty_names |= assigned_names([stmt])
+                body.extend(result)
+                new_settled.extend([False] * len(result))
+
+        tree = ast.Module(body, tree.type_ignores)
+        settled = new_settled
+        if not changed:
+            return FixedPointResult(tree, passes, True)
+    return FixedPointResult(tree, options.max_passes, False)
@@ -0,0 +1,208 @@
+import ast
+import math
+import operator
+import re
+import sys
+from typing import Any, Callable, List, Optional
+
+from simplify.data import BIN_OPS, PURE_MODULES
+from simplify.exceptions import BudgetExceededError
+from simplify.options import Options
+
+# numbers inside `%`-format conversion specifiers, e.g. `10` and `3` in `%10.3f`
+_FORMAT_SPEC_NUMBERS = re.compile(r"%[#0 +\-]*(\*|\d*)(?:\.(\*|\d*))?")
+
+
+class CannotFold(Exception):
+    pass
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, (str, bytes, tuple, frozenset)):
+        return len(value)
+    return 0
+
+
+def _check_int_bits(bits: int, options: Options):
+    if bits > options.max_int_bits:
+        raise CannotFold(f"Result would exceed {options.max_int_bits} bits.")
+
+
+def _check_length(length: int, options: Options):
+    if length > options.max_sequence_length:
+        raise CannotFold(f"Result would exceed {options.max_sequence_length} elements.")
+
+
+# Estimate the size of the result of a binary operation before evaluating it, since evaluating e.g. `10 ** 10 ** 8` or
+# `"x" * 10 ** 9` is exactly what must be avoided.
+def check_bin_op(op: ast.operator, lval: Any, rval: Any, options: Options):
+    ints = isinstance(lval, int) and isinstance(rval, int)
+    match op:
+        case ast.Pow() if ints and rval > 0 and abs(lval) > 1:
+            _check_int_bits(abs(lval).bit_length() * rval, options)
+        case ast.LShift() if ints and rval > 0:
+            _check_int_bits(abs(lval).bit_length() + rval, options)
+        case ast.Mult() if ints:
+            _check_int_bits(abs(lval).bit_length() + abs(rval).bit_length(), options)
+        case ast.Mult() if isinstance(rval, int):
+            _check_length(_size(lval) * rval, options)
+        case ast.Mult() if isinstance(lval, int):
+            _check_length(lval * _size(rval), options)
+        case ast.Add():
+            _check_length(_size(lval) + _size(rval), options)
+        case ast.Mod() if isinstance(lval, (str, bytes)):
+            spec = lval if isinstance(lval, str) else lval.decode("latin-1")
+            length = len(spec)
+            for width, precision in _FORMAT_SPEC_NUMBERS.findall(spec):
+                if "*" in (width, precision):
+                    raise CannotFold("Format widths given as arguments are not supported.")
+                length += int(width or 0) + int(precision or 0)
+            _check_length(length, options)
+
+
+def evaluate(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    try:
+        return fn(*args, **kwargs)
+    except (ArithmeticError, TypeError, ValueError) as e:
+        # leave the expression to fail at run time
+        raise CannotFold(str(e)) from e
+
+
+# operators evaluated by pure functions (see `PURE_FUNCTIONS`), whose results are estimated like those of `BinOp`s
+_BIN_OP_FUNCTIONS = {fn: op for op, fn in BIN_OPS.items()} | {operator.concat: ast.Add, pow: ast.Pow}
+
+
+def literal(node: ast.expr) -> Any:
+    match node:
+        case ast.Constant(value):
+            return value
+        case ast.Tuple(elts):
+            return tuple(map(literal, elts))
+        case ast.List(elts):
+            return list(map(literal, elts))
+        case ast.Set(elts):
+            try:
+                return set(map(literal, elts))
+            except TypeError as e:  # unhashable elements
+                raise CannotFold(str(e)) from e
+    raise CannotFold("Not a literal.")
+
+
+def is_constant(value: Any) -> bool:
+    if type(value) is tuple:
+        return all(map(is_constant, value))
+    return type(value) in (int, float, complex, str, bytes, bool, type(None))
+
+
+# Estimate the size of the result of calling a pure function, before calling it, for the functions whose results can
+# grow much faster than their arguments.
+def check_call(fn: Callable, args: List[Any], kwargs: dict, options: Options):
+    guarded = fn in _BIN_OP_FUNCTIONS or fn in (math.factorial, math.comb, math.perm, math.prod, math.lcm)
+    if guarded and kwargs:
+        raise CannotFold("Keyword arguments of functions with guarded results are not supported.")
+    if fn is math.perm and (len(args) == 1 or len(args) == 2 and args[1] is None):
+        fn, args = math.factorial, args[:1]  # `perm(n)` is `factorial(n)`
+    ints = all(isinstance(a, int) for a in args)
+    if fn in _BIN_OP_FUNCTIONS and (len(args) == 2 or fn is pow and len(args) == 3 and args[2] is None):
+        check_bin_op(_BIN_OP_FUNCTIONS[fn](), args[0], args[1], options)
+    elif fn is math.factorial and ints and len(args) == 1 and args[0] > 0:
+        _check_int_bits(args[0] * args[0].bit_length(), options)
+    elif fn in (math.comb, math.perm) and ints and len(args) == 2 and args[0] > 0 and args[1] > 0:
+        _check_int_bits(min(args) * args[0].bit_length(), options)
+    elif fn in (math.prod, math.lcm):
+        values = args[0] if fn is math.prod and args else args
+        if isinstance(values, (tuple, list, set)) and all(isinstance(v, int) for v in values):
+            _check_int_bits(sum(abs(v).bit_length() for v in values), options)
+
+
+# The qualified name (e.g. `len` or `math.sqrt`) of the function called through `func`, if it is a builtin that is
+# neither bound in the scope nor shadowed anywhere in the module, or a function of a module of pure functions (see
+# `PURE_MODULES`) imported once under its name.
+def called_function(func: ast.expr, simp) -> Optional[str]:
+    if simp.shadowed is None:
+        return None
+    match func:
+        case ast.Name(name, ast.Load()) if name not in simp.shadowed:
+            match simp.scope.get(name):
+                case None if name not in simp.imported:
+                    return name
+                case ast.ImportFrom(module, aliases, 0) if module in PURE_MODULES:
+                    for alias in aliases:
+                        if (alias.asname or alias.name) == name:
+                            return f"{module}.{alias.name}"
+        case ast.Attribute(ast.Name(name), attr, ast.Load()) if name not in simp.shadowed:
+            match simp.scope.get(name):
+                case ast.Import(aliases):
+                    for alias in aliases:
+                        if (alias.asname or alias.name.split(".")[0]) == name and alias.name in PURE_MODULES:
+                            return f"{alias.name}.{attr}"
+    return None
+
+
+# Evaluate a call to the pure function `fn` whose arguments are literals, unless its result is not a constant or
+# exceeds the limits of `options`.
+def fold_call(fn: Callable, args: List[ast.expr], keywords: List[ast.keyword], options: Options) -> Any:
+    if any(k.arg is None for k in keywords):
+        raise CannotFold("Keyword arguments are unpacked.")
+    arg_values = [literal(a) for a in args]
+    kwarg_values = {k.arg: literal(k.value) for k in keywords}
+    check_call(fn, arg_values, kwarg_values, options)
+    value = evaluate(fn, *arg_values, **kwarg_values)
+    if not is_constant(value):
+        raise CannotFold("Result is not a constant.")
+    if isinstance(value, int):
+        _check_int_bits(value.bit_length(), options)
+    _check_length(_size(value), options)
+    return value
+
+
+# Account for the memory held by a folded constant, failing once the simplifier's memory budget is used up.
+def charge(simp, value: Any):
+    budget = simp.options.memory_budget
+    if budget is None:
+        return
+    simp.folded_bytes += sys.getsizeof(value)
+    if simp.folded_bytes > budget:
+        raise BudgetExceededError(f"Folded constants exceed the memory budget of {budget} bytes.")
+
+
+# Operators whose chains (e.g. `a + b + c`, parsed as `(a + b) + c`) are folded as a whole. They are associative and
+# commutative on integers only, so operands are only reordered with `Options.reassociate`.
+ASSOCIATIVE_OPS = (ast.Add, ast.Mult, ast.BitOr, ast.BitAnd, ast.BitXor)
+
+
+# The operands of the chain of `node`'s operator starting at `node`, found iteratively along the left spine. Nodes of
+# other operators have their two operands.
+def chain_operands(node: ast.BinOp) -> list:
+    op = type(node.op)
+    if op not in ASSOCIATIVE_OPS:
+        return [node.left, node.right]
+    operands = []
+    while isinstance(node, ast.BinOp) and type(node.op) is op:
+        operands.append(node.right)
+        node = node.left
+    operands.append(node)
+    operands.reverse()
+    return operands
+
+
+def fold_values(op: ast.operator, values: list, options: Options) -> Any:
+    fn = BIN_OPS[type(op)]
+    result = values[0]
+    for value in values[1:]:
+        check_bin_op(op, result, value, options)
+        result = evaluate(fn, result, value)
+    return result
+
+
+def build_chain(op: ast.operator, operands: list, balanced: bool = False) -> ast.expr:
+    if not balanced:
+        node = operands[0]
+        for operand in operands[1:]:
+            node = ast.BinOp(node, op, operand)
+        return node
+    # pairing neighbouring operands level by level keeps their order while the depth only grows logarithmically
+    while len(operands) > 1:
+        pairs = [ast.BinOp(left, op, right) for left, right in zip(operands[::2], operands[1::2])]
+        operands = pairs + operands[len(pairs) * 2 :]
+    return operands[0]
@@ -0,0 +1,149 @@
+import ast
+from typing import Any, Dict, List
+
+_HASH_ATTR = "_structural_hash"
+_SIZE_ATTR = "_tree_size"
+
+
+# Structural hashes are cached on the nodes themselves, which are therefore treated as immutable once hashed (the
+# simplifier never mutates nodes in place, see `Simplifier.generic_visit`). Call `invalidate` after mutating a hashed
+# tree in place.
+def structural_hash(x: Any) -> int:
+    if isinstance(x, ast.AST):
+        h = x.__dict__.get(_HASH_ATTR)
+        if h is None:
+            h = _hash_tree(x)
+        return h
+    if isinstance(x, (list, tuple, frozenset)):
+        # containers occur as node fields (lists) and as constant values (tuples and frozensets)
+        items = sorted(map(structural_hash, x)) if isinstance(x, frozenset) else map(structural_hash, x)
+        return hash((type(x), *items))
+    try:
+        return hash((type(x), x))
+    except TypeError:
+        return hash((type(x), id(x)))
+
+
+def _unhashed_children(node: ast.AST) -> List[ast.AST]:
+    children = []
+    for attr in node.__match_args__:
+        value = getattr(node, attr, None)
+        for child in value if isinstance(value, list) else [value]:
+            if isinstance(child, ast.AST) and _HASH_ATTR not in child.__dict__:
+                children.append(child)
+    return children
+
+
+# Hashes the unhashed nodes of a tree bottom-up from an explicit stack, so that deeply nested trees (e.g. long operator
+# chains) do not exhaust the interpreter stack.
+def _hash_tree(root: ast.AST) -> int:
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        children = _unhashed_children(node)
+        if children:
+            stack.extend(children)
+            continue
+        stack.pop()
+        if _HASH_ATTR not in node.__dict__:
+            h = hash((type(node), *(structural_hash(getattr(node, attr, None)) for attr in node.__match_args__)))
+            setattr(node, _HASH_ATTR, h)
+    return root.__dict__[_HASH_ATTR]
+
+
+# Number of nodes of a tree (counted like `ast.walk`), cached on its nodes like structural hashes, so that only the
+# nodes created since subtrees were last measured are visited.
+def tree_size(x: Any) -> int:
+    if isinstance(x, list):
+        return sum(map(tree_size, x))
+    if not isinstance(x, ast.AST):
+        return 0
+    stack = [x]
+    while stack:
+        node = stack[-1]
+        if _SIZE_ATTR in node.__dict__:
+            stack.pop()
+            continue
+        children = _child_nodes(node)
+        unsized = [child for child in children if _SIZE_ATTR not in child.__dict__]
+        if unsized:
+            stack.extend(unsized)
+            continue
+        stack.pop()
+        setattr(node, _SIZE_ATTR, 1 + sum(child.__dict__[_SIZE_ATTR] for child in children))
+    return x.__dict__[_SIZE_ATTR]
+
+
+def _child_nodes(node: ast.AST) -> List[ast.AST]:
+    children = []
+    for attr in node._fields:
+        value = getattr(node, attr, None)
+        if isinstance(value, list):
+            children.extend(child for child in value if isinstance(child, ast.AST))
+        elif isinstance(value, ast.AST):
+            children.append(value)
+    return children
+
+
+def invalidate(node: ast.AST):
+    for n in ast.walk(node):
+        n.__dict__.pop(_HASH_ATTR, None)
+        n.__dict__.pop(_SIZE_ATTR, None)
+
+
+def eq_nodes(x, y) -> bool:
+    pairs = [(x, y)]
+    while pairs:
+        x, y = pairs.pop()
+        if x is y:
+            continue
+        if type(x) is not type(y):
+            return False
+        # cached hashes tell most unequal subtrees apart at once, but hashing trees only to compare them would visit
+        # them in full, whereas the comparison stops at the first difference
+        if isinstance(x, ast.AST):
+            x_hash, y_hash = x.__dict__.get(_HASH_ATTR), y.__dict__.get(_HASH_ATTR)
+            if x_hash is not None and y_hash is not None and x_hash != y_hash:
+                return False
+        if isinstance(x, list):
+            if not len(x) == len(y):
+                return False
+            pairs.extend(zip(x, y))
+        elif isinstance(x, ast.AST):
+            pairs.extend((getattr(x, attr), getattr(y, attr)) for attr in x.__match_args__)
+        elif not same_value(x, y):
+            return False
+    return True
+
+
+# Whether two constant values are interchangeable: equal, of the same type and, for floats, of the same sign (`0.0` and
+# `-0.0` are equal, but e.g. `math.copysign` tells them apart).
+def same_value(x: Any, y: Any) -> bool:
+    if type(x) is not type(y):
+        return False
+    if type(x) in (float, complex):
+        return repr(x) == repr(y)
+    if type(x) is tuple:
+        return len(x) == len(y) and all(map(same_value, x, y))
+    if type(x) is frozenset:
+        return x == y and sorted(map(repr, x)) == sorted(map(repr, y))
+    return x == y
+
+
+class Interner:
+    # Hash-consing table of constants: equal constants built by the simplifier (e.g. folded results) share one node.
+
+    def __init__(self):
+        self.constants: Dict[Any, ast.Constant] = {}
+
+    def constant(self, value: Any) -> ast.Constant:
+        # the type is part of the key since e.g. `1 == 1.0 == True`, and floats are keyed on their representation since
+        # `0.0 == -0.0` (other equal but distinct values, e.g. in tuples, replace each other in the table)
+        try:
+            key = (type(value), structural_hash(value), repr(value) if type(value) in (float, complex) else value)
+            node = self.constants.get(key)
+        except TypeError:  # unhashable value
+            return ast.Constant(value)
+        if node is None or not same_value(node.value, value):
+            node = self.constants[key] = ast.Constant(value)
+        return node
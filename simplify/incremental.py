@@ -0,0 +1,115 @@
+import ast
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from simplify.cache import cache_key
+from simplify.fixed_point import FixedPointResult, simplify_to_fixed_point
+from simplify.hashing import eq_nodes, invalidate
+from simplify.inlining import InlineCache
+from simplify.options import Options
+from simplify.simplifier import Simplifier
+from simplify.utils import import_bindings
+
+
+# Path under `cache_dir` of the state of the incremental session of the file at `path`. It is kept alongside (and
+# evicted with) the entries of `ResultCache`.
+def state_path(cache_dir: os.PathLike, path: os.PathLike, bindings: dict, options: Options) -> Path:
+    key = cache_key(os.path.abspath(path), bindings, options)
+    return Path(cache_dir, "incremental", hashlib.sha256(key.encode()).hexdigest())
+
+
+class Snapshot(NamedTuple):
+    stmt: ast.stmt  # top-level statement of the input
+    output: List[ast.stmt]  # result of simplifying it
+    scope: tuple  # state of the global scope after simplifying it (see `Scope.snapshot`)
+    folded_bytes: int
+    inlined_nodes: int
+
+
+# Simplifies successive versions of a module, re-simplifying only from the first top-level statement that differs from
+# the previous version. The state of the simplifier is recorded after each top-level statement (where only the global
+# scope is open), so that simplification of the changed suffix resumes from the state reached by the unchanged prefix.
+class IncrementalSession:
+    def __init__(self, bindings: Optional[dict] = None, options: Optional[Options] = None):
+        self.bindings = bindings
+        self.options = options or Options()
+        self.snapshots: List[Snapshot] = []
+        # names bound by the imports of the previous version, and names shadowing builtins and imports in it (see
+        # `import_bindings`), on which the evaluation of calls to pure functions in the whole module depends
+        self.import_bindings: Optional[tuple] = None
+        self.reused = 0  # number of top-level statements reused by the last call to `simplify`
+        self.inline_cache = InlineCache()
+
+    def simplify(self, tree: ast.Module) -> FixedPointResult:
+        prefix = 0
+        names = import_bindings(tree)
+        if names != self.import_bindings:
+            self.snapshots = []
+        self.import_bindings = names
+        for snapshot, stmt in zip(self.snapshots, tree.body):
+            if not eq_nodes(snapshot.stmt, stmt):
+                break
+            prefix += 1
+
+        simp = Simplifier(self.bindings, self.options._replace(max_passes=1))
+        simp.inline_cache = self.inline_cache
+        simp.imported, simp.shadowed = names
+        snapshots = self.snapshots[:prefix]
+        if snapshots:
+            simp.global_scope.restore(snapshots[-1].scope)
+            simp.folded_bytes = snapshots[-1].folded_bytes
+            simp.inlined_nodes = snapshots[-1].inlined_nodes
+        for stmt in tree.body[prefix:]:
+            output = simp.visit([stmt])
+            snapshots.append(
+                Snapshot(stmt, output, simp.global_scope.snapshot(), simp.folded_bytes, simp.inlined_nodes)
+            )
+        self.snapshots = snapshots
+        self.reused = prefix
+
+        result = ast.Module([stmt for snapshot in snapshots for stmt in snapshot.output], tree.type_ignores)
+        if self.options.max_passes == 1:
+            converged = all(len(s.output) == 1 and eq_nodes(s.output[0], s.stmt) for s in snapshots)
+            return FixedPointResult(result, 1, converged)
+        # later passes start from fresh bindings (see `simplify_to_fixed_point`) and are not incremental
+        options = self.options._replace(max_passes=self.options.max_passes - 1)
+        fixed_point = simplify_to_fixed_point(result, self.bindings, options)
+        return FixedPointResult(fixed_point.tree, fixed_point.passes + 1, fixed_point.converged)
+
+    def __getstate__(self) -> dict:
+        # structural hashes are cached on nodes but not stable across processes (string hashing is randomized)
+        for snapshot in self.snapshots:
+            for node in [snapshot.stmt, *snapshot.output, *snapshot.scope[0].values()]:
+                if isinstance(node, ast.AST):
+                    invalidate(node)
+        return {
+            "bindings": self.bindings,
+            "options": self.options,
+            "snapshots": self.snapshots,
+            "import_bindings": self.import_bindings,
+        }
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["bindings"], state["options"])
+        self.snapshots = state["snapshots"]
+        self.import_bindings = state["import_bindings"]
+
+    def dump(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(pickle.dumps(self))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, bindings: Optional[dict] = None, options: Optional[Options] = None):
+        # the state is only reused if it was recorded with the same bindings and options
+        try:
+            session = pickle.loads(path.read_bytes())
+        except Exception:  # missing, or written by an incompatible version
+            return cls(bindings, options)
+        if not isinstance(session, cls) or session.bindings != bindings or session.options != (options or Options()):
+            return cls(bindings, options)
+        return session
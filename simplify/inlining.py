@@ -0,0 +1,135 @@
+import ast
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from simplify.bindings import get_bindings
+from simplify.hashing import eq_nodes, structural_hash, tree_size
+from simplify.liveness import is_pure
+from simplify.utils import assigned_names, loaded_names
+
+if TYPE_CHECKING:
+    from simplify.simplifier import Simplifier
+else:
+    Simplifier = "Simplifier"
+
+NOT_INLINABLE = object()
+
+
+class _FunctionRecord:
+    __slots__ = ("fn_def", "params", "free_names", "cacheable", "results")
+
+    def __init__(self, fn_def: ast.FunctionDef):
+        args = fn_def.args
+        self.fn_def = fn_def
+        self.params = [a.arg for a in args.posonlyargs + args.args]
+        local_names = assigned_names(fn_def.body) | {
+            a.arg for a in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg] if a
+        }
+        # the inlined result also depends on the current values of the names the function reads from enclosing scopes
+        self.free_names = sorted(set().union(*map(loaded_names, fn_def.body)) - local_names)
+        # functions declaring globals write to enclosing scopes when inlined, which a cache hit would skip
+        self.cacheable = not any(isinstance(n, (ast.Global, ast.Nonlocal)) for n in ast.walk(fn_def))
+        self.results: Dict[int, List[Tuple[list, object]]] = {}
+
+
+# Memoizes the results of inlining calls to functions. Results are keyed on the function definition (by identity, so
+# that rebinding its name to another definition invalidates them), on the bound argument expressions and on the values
+# of the function's free names.
+class InlineCache:
+    def __init__(self):
+        self.functions: Dict[int, _FunctionRecord] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def record(self, fn_def: ast.FunctionDef) -> _FunctionRecord:
+        record = self.functions.get(id(fn_def))
+        if record is None or record.fn_def is not fn_def:
+            record = self.functions[id(fn_def)] = _FunctionRecord(fn_def)
+        return record
+
+    def discard(self, fn_def: ast.FunctionDef):
+        record = self.functions.get(id(fn_def))
+        if record is not None and record.fn_def is fn_def:
+            del self.functions[id(fn_def)]
+
+    def get(self, record: _FunctionRecord, inputs: list) -> object:
+        for cached_inputs, result in record.results.get(structural_hash(inputs), []):
+            if eq_nodes(cached_inputs, inputs):
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, record: _FunctionRecord, inputs: list, result: object):
+        record.results.setdefault(structural_hash(inputs), []).append((inputs, result))
+
+
+@contextmanager
+def inline_frame(simp: Simplifier):
+    simp.inline_depth += 1
+    try:
+        yield
+    finally:
+        simp.inline_depth -= 1
+
+
+def can_inline(simp: Simplifier) -> bool:
+    return simp.inline_depth < simp.options.max_inline_depth and simp.inlined_nodes < simp.options.max_inline_growth
+
+
+# Accounts for the growth of the tree caused by inlining `result` at a call site, returning `None` (so that the call is
+# kept) if this exceeds the inlining budget. Results that are not inlined are charged too, since they were computed: the
+# budget bounds the work done by attempts to inline (e.g. recursive functions calling themselves several times would
+# otherwise take time exponential in `max_inline_depth`).
+def charge(simp: Simplifier, result: ast.expr) -> Optional[ast.expr]:
+    size = tree_size(result)
+    options = simp.options
+    simp.inlined_nodes += size
+    if size > options.max_inline_nodes or simp.inlined_nodes > options.max_inline_growth:
+        if simp.profiler is not None:
+            simp.profiler.count("inline.over_budget")
+        return None
+    return result
+
+
+def inline_function(fn_def: ast.FunctionDef, call: ast.Call, simp: Simplifier) -> Optional[ast.expr]:
+    if not can_inline(simp):
+        return None
+    record = simp.inline_cache.record(fn_def)
+    bindings = get_bindings(fn_def.args, call)
+    if not set(record.params) <= bindings.keys():
+        return None  # the call could not be bound to the function's parameters
+
+    inputs: Optional[list] = None
+    if record.cacheable:
+        inputs = [bindings.get(name) for name in record.params] + [simp.scope.get(n) for n in record.free_names]
+        result = simp.inline_cache.get(record, inputs)
+        if simp.profiler is not None:
+            simp.profiler.count("inline_cache.hits" if result is not None else "inline_cache.misses")
+        if result is not None:
+            return None if result is NOT_INLINABLE else charge(simp, result)
+
+    result = NOT_INLINABLE
+    with simp.new_scope(bindings), inline_frame(simp):
+        body = simp.visit(fn_def.body)
+        # stores kept by dead code elimination are local to the function and can be skipped if the result does not
+        # depend on them
+        stores = []
+        while body and isinstance(body[0], ast.Assign) and is_pure(body[0].value):
+            stores.append(body.pop(0))
+        match body:
+            case [ast.Return(None), *_]:
+                result = simp.interner.constant(None)
+            case [ast.Return(value), *_] if not loaded_names(value) & assigned_names(stores):
+                result = value
+    if inputs is not None:
+        simp.inline_cache.put(record, inputs, result)
+    if result is NOT_INLINABLE:
+        simp.inlined_nodes += tree_size(fn_def.body)  # simplified in vain (see `charge`)
+        return None
+    return charge(simp, result)
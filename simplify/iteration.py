@@ -0,0 +1,125 @@
+import ast
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from simplify.folding import CannotFold, called_function, evaluate, is_constant, literal
+from simplify.options import Options
+
+if TYPE_CHECKING:
+    from simplify.simplifier import Simplifier
+else:
+    Simplifier = "Simplifier"
+
+# builtins whose results are iterated over lazily, and are materialized when their arguments are
+ITERATORS = {"range": range, "enumerate": enumerate, "zip": zip, "reversed": reversed}
+
+Bindings = List[Tuple[str, ast.Constant]]
+
+
+def iteration_limit(options: Options) -> int:
+    return options.max_sequence_length if options.max_unroll is None else options.max_unroll
+
+
+def _check_limit(length: int, limit: int):
+    if length > limit:
+        raise CannotFold(f"Iteration would exceed {limit} steps.")
+
+
+# The values produced by iterating over `node`, if it is a finite iterable of constants: a literal tuple, list, string
+# or bytes, or the result of an iterator builtin over such iterables. Sets are not iterated over since the order of
+# their elements depends on hashing.
+def _values(node: ast.expr, simp: Simplifier, limit: int) -> list:
+    match node:
+        case ast.Call(func, args, []) if (name := called_function(func, simp)) in ITERATORS:
+            if name == "range":
+                bounds = [literal(a) for a in args]
+                if not all(type(b) is int for b in bounds):
+                    raise CannotFold("Range bounds are not integers.")
+                values = evaluate(range, *bounds)
+                try:
+                    length = len(values)
+                except OverflowError:
+                    raise CannotFold("Range is too long.") from None
+                _check_limit(length, limit)
+            elif name == "enumerate" and len(args) in (1, 2):
+                start = literal(args[1]) if len(args) == 2 else 0
+                if type(start) is not int:
+                    raise CannotFold("Start is not an integer.")
+                values = enumerate(_values(args[0], simp, limit), start)
+            elif name == "zip" and args:
+                values = zip(*(_values(a, simp, limit) for a in args))
+            elif name == "reversed" and len(args) == 1:
+                values = reversed(_values(args[0], simp, limit))
+            else:
+                raise CannotFold(f"Unsupported call to {name}.")
+            return list(values)
+    value = literal(node)
+    if not isinstance(value, (tuple, list, str, bytes)):
+        raise CannotFold("Not an ordered iterable.")
+    _check_limit(len(value), limit)
+    if not all(map(is_constant, value)):
+        raise CannotFold("Elements are not constants.")
+    return list(value)
+
+
+def _unpack(target: ast.expr, value: Any) -> List[Tuple[str, Any]]:
+    match target:
+        case ast.Name(id):
+            return [(id, value)]
+        case ast.Tuple(elts) | ast.List(elts) if not any(isinstance(e, ast.Starred) for e in elts):
+            if not isinstance(value, (tuple, str, bytes)) or len(value) != len(elts):
+                raise CannotFold("Values cannot be unpacked into the target.")  # left to fail at run time
+            return [binding for elt, item in zip(elts, value) for binding in _unpack(elt, item)]
+    raise CannotFold("Unsupported target.")
+
+
+# The bindings of the names of `target` made by each iteration over `iter_`, if `iter_` (already simplified) is a finite
+# iterable of constants of at most `iteration_limit` values which can all be unpacked into `target`.
+def iterations(target: ast.expr, iter_: ast.expr, simp: Simplifier) -> Optional[List[Bindings]]:
+    try:
+        values = _values(iter_, simp, iteration_limit(simp.options))
+        bindings = [_unpack(target, value) for value in values]
+    except CannotFold:
+        return None
+    return [[(name, simp.interner.constant(value)) for name, value in b] for b in bindings]
+
+
+# The elements (or, for dictionary comprehensions, the key-value pairs) produced by a comprehension over finite
+# iterables of constants whose conditions and elements all simplify to constants. Each iteration is simplified in its
+# own scope binding the targets of the comprehension, and the number of iterations is limited by `iteration_limit`.
+def comprehension_values(
+    node: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp, simp: Simplifier
+) -> Optional[list]:
+    if any(g.is_async for g in node.generators) or any(isinstance(n, ast.NamedExpr) for n in ast.walk(node)):
+        return None  # assignment expressions bind names in the enclosing scope
+    is_dict = isinstance(node, ast.DictComp)
+    results = []
+    steps_left = iteration_limit(simp.options)
+
+    def expand(index: int):
+        nonlocal steps_left
+        if index == len(node.generators):
+            values = [literal(v) for v in simp.visit([node.key, node.value] if is_dict else [node.elt])]
+            if not all(map(is_constant, values)):
+                raise CannotFold("Elements are not constants.")
+            results.append(tuple(values) if is_dict else values[0])
+            return
+        generator = node.generators[index]
+        steps = iterations(generator.target, simp.visit(generator.iter), simp)
+        if steps is None:
+            raise CannotFold("Not a finite iterable of constants.")
+        for bindings in steps:
+            steps_left -= 1
+            if steps_left < 0:
+                raise CannotFold("Iteration would exceed the limit.")
+            with simp.new_scope(dict(bindings)):
+                tests = simp.visit(generator.ifs)
+                if not all(isinstance(t, ast.Constant) for t in tests):
+                    raise CannotFold("Conditions are not constants.")
+                if all(t.value for t in tests):
+                    expand(index + 1)
+
+    try:
+        expand(0)
+    except CannotFold:
+        return None
+    return results
@@ -0,0 +1,164 @@
+import ast
+from typing import List, NamedTuple, Set, Tuple
+
+from simplify.utils import loaded_names, replace
+
+# builtins through which a function can read its local variables by name
+INTROSPECTION_BUILTINS = {"dir", "eval", "exec", "locals", "vars"}
+
+PURE_NODES = (ast.Constant, ast.Name, ast.Tuple, ast.List, ast.Set, ast.Dict, ast.Lambda, ast.expr_context)
+DUPLICABLE_NODES = (ast.Constant, ast.Tuple, ast.UnaryOp, ast.BinOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Lambda)
+OPERATORS = (ast.expr_context, ast.unaryop, ast.operator, ast.boolop, ast.cmpop)
+
+
+def _only(node: ast.AST, allowed: tuple) -> bool:
+    # the bodies of lambdas are not evaluated when the lambda is, so only their default values are inspected
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if not isinstance(n, allowed):
+            return False
+        if isinstance(n, ast.Lambda):
+            stack.extend(n.args.defaults)
+            stack.extend(d for d in n.args.kw_defaults if d is not None)
+        else:
+            stack.extend(ast.iter_child_nodes(n))
+    return True
+
+
+# whether evaluating `node` has no effect other than producing its value
+def is_pure(node: ast.AST) -> bool:
+    return _only(node, PURE_NODES)
+
+
+# whether evaluating `node` wherever its value is used is equivalent to evaluating it once (it reads no variables and
+# creates no mutable objects)
+def is_duplicable(node: ast.AST) -> bool:
+    return _only(node, DUPLICABLE_NODES + OPERATORS)
+
+
+# names whose values are read by `node`: unlike `loaded_names`, this includes the targets of augmented assignments and
+# deletions
+def _reads(node: ast.AST) -> Set[str]:
+    names = loaded_names(node)
+    for n in ast.walk(node):
+        match n:
+            case ast.AugAssign(ast.Name(id)) | ast.Name(id, ast.Del()):
+                names.add(id)
+    return names
+
+
+class _Context(NamedTuple):
+    protected: Set[str]  # names whose stores are never removed
+    guard: Set[str]  # names live at every point of the current block (read by enclosing exception handlers)
+    loop_live: Set[str]  # names live after a `break` or `continue` in the current block
+
+
+def _removable_def(stmt: ast.stmt) -> bool:
+    args = stmt.args
+    return not stmt.decorator_list and all(is_pure(d) for d in [*args.defaults, *args.kw_defaults] if d is not None)
+
+
+# Removes the dead statements of `stmts`, given the names `live` after them. Returns the remaining statements and the
+# names live before them. The analysis is a single backward pass: loops and exception handlers are not iterated to a
+# fixed point, but every name they read is instead considered live throughout them.
+def _block(stmts: List[ast.stmt], live: Set[str], ctx: _Context) -> Tuple[List[ast.stmt], Set[str]]:
+    result = []
+    for stmt in reversed(stmts):
+        live = live | ctx.guard
+        match stmt:
+            case ast.Assign(targets, value) if all(
+                isinstance(t, ast.Name) and t.id not in live and t.id not in ctx.protected for t in targets
+            ):
+                if is_pure(value):
+                    continue
+                stmt = ast.Expr(value)  # the store is dead but evaluating the value may have effects
+                live = live | _reads(value)
+            case ast.Assign(targets, value) if all(isinstance(t, ast.Name) for t in targets):
+                live = (live - {t.id for t in targets}) | _reads(value)
+            case ast.FunctionDef(name) | ast.AsyncFunctionDef(name) if name not in live and name not in ctx.protected:
+                if _removable_def(stmt):
+                    continue
+                stmt = _function(stmt)
+                live = live | _reads(stmt)
+            case ast.FunctionDef(name) | ast.AsyncFunctionDef(name):
+                stmt = _function(stmt)
+                live = (live - {name}) | _reads(stmt)
+            case ast.Return(value):
+                live = ctx.guard | (_reads(value) if value else set())
+            case ast.Break() | ast.Continue():
+                live = ctx.loop_live | ctx.guard
+            case ast.If(test, body, orelse):
+                body, body_live = _block(body, live, ctx)
+                orelse, orelse_live = _block(orelse, live, ctx)
+                stmt = replace(stmt, body=body or [ast.Pass()], orelse=orelse)
+                live = body_live | orelse_live | _reads(test)
+            case ast.For() | ast.AsyncFor() | ast.While():
+                loop_loads = _reads(stmt)
+                orelse, orelse_live = _block(stmt.orelse, live, ctx)
+                body, _ = _block(stmt.body, live | loop_loads, ctx._replace(loop_live=live | loop_loads))
+                stmt = replace(stmt, body=body or [ast.Pass()], orelse=orelse)
+                live = live | orelse_live | loop_loads
+            case ast.With(items, body) | ast.AsyncWith(items, body):
+                body, body_live = _block(body, live, ctx)
+                stmt = replace(stmt, body=body or [ast.Pass()])
+                live = body_live | set().union(*map(_reads, items))
+            case ast.Try(body, handlers, orelse, finalbody):
+                final_loads = set().union(*map(_reads, finalbody))
+                handled = ctx._replace(guard=ctx.guard | final_loads)
+                guarded = ctx._replace(guard=ctx.guard | _reads(stmt))
+                finalbody, final_live = _block(finalbody, live, ctx)
+                orelse, orelse_live = _block(orelse, final_live, handled)
+                handlers = [replace(h, body=_block(h.body, final_live, handled)[0] or [ast.Pass()]) for h in handlers]
+                body, _ = _block(body, orelse_live, guarded)
+                stmt = replace(stmt, body=body or [ast.Pass()], handlers=handlers, orelse=orelse, finalbody=finalbody)
+                live = live | _reads(stmt)
+            case _:
+                live = live | _reads(stmt)
+        result.append(stmt)
+    result.reverse()
+    return result, live | ctx.guard
+
+
+def _nested_loads(fn: ast.AST) -> Set[str]:
+    # names read by functions (and lambdas and classes) nested in `fn`, possibly after `fn` stores them
+    names = set()
+    for stmt in fn.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                names |= _reads(node)
+    return names
+
+
+def _function(fn: ast.FunctionDef) -> ast.FunctionDef:
+    declared = {name for node in ast.walk(fn) if isinstance(node, (ast.Global, ast.Nonlocal)) for name in node.names}
+    if _reads(fn) & INTROSPECTION_BUILTINS:
+        return replace(fn, body=_definitions(fn.body))
+    ctx = _Context(protected=declared | _nested_loads(fn), guard=set(), loop_live=set())
+    body, _ = _block(fn.body, set(), ctx)
+    return replace(fn, body=body or [ast.Pass()])
+
+
+def _definitions(stmts: List[ast.stmt]) -> List[ast.stmt]:
+    # outside of functions, stores are observable (e.g. by importers of a module) and only the bodies of functions are
+    # rewritten
+    result = []
+    for stmt in stmts:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            stmt = _function(stmt)
+        else:
+            changes = {}
+            for field, value in ast.iter_fields(stmt):
+                if isinstance(value, list) and value and isinstance(value[0], ast.stmt):
+                    changes[field] = _definitions(value)
+                elif field == "handlers":
+                    changes[field] = [replace(h, body=_definitions(h.body)) for h in value]
+            stmt = replace(stmt, **changes) if changes else stmt
+        result.append(stmt)
+    return result
+
+
+# Removes the stores to local variables of functions that are never read afterwards, and the definitions of local
+# functions that are never referenced.
+def eliminate_dead_code(tree: ast.Module) -> ast.Module:
+    return replace(tree, body=_definitions(tree.body))
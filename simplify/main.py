@@ -1,50 +1,228 @@
-import ast
-import inspect
+import sys
 from typing import List, Optional
 
 import typer
 
-from simplify.simplifier import Simplifier
-from simplify.utils import load_obj_from_path, parse_bindings
-
-
-def transform_source(source: str, bind_list: Optional[List[str]] = None) -> str:
-    if bind_list is None:
-        bind_list = []
-    tree = ast.parse(source)
-    bindings = parse_bindings(bind_list)
-    result = Simplifier(bindings).visit(tree)
-    text = ast.unparse(result)
-    return text
+from simplify.api import transform_source
+from simplify.cache import DEFAULT_CACHE_DIR, ResultCache
+from simplify.incremental import IncrementalSession, state_path
+from simplify.modules import ModuleResolver, find_source
+from simplify.options import Options
+from simplify.profiling import Profiler
+from simplify.rules import RULE_NAMES
+from simplify.utils import parse_bindings
 
 
 def main(
     stdin: bool = typer.Option(False, help="Read multi-line source from standard input."),
+    stream: str = typer.Option(
+        "",
+        help="Simplify each of the documents read from standard input as it arrives, writing each result as soon as it "
+        "is ready. Documents are separated by NUL bytes (`nul`) or given as JSON lines (`jsonl`).",
+    ),
     source: str = typer.Option("", help="Inline source text."),
     file: typer.FileText = typer.Option(None, help="Path to source file."),
     module: str = typer.Option("", help="Python path to module or object therein of the form `module_path:obj_name`."),
+    recursive: str = typer.Option("", help="Path to directory whose `.py` files are simplified in batch."),
+    watch: str = typer.Option(
+        "", help="Path to a file or directory whose `.py` files are simplified again whenever they change."
+    ),
     bind: Optional[List[str]] = typer.Option(
         None, help="Statement of the form `name=val` binding value of constant expression to variable."
     ),
+    jobs: int = typer.Option(0, help="Number of worker processes used with `--recursive` (0 for one per core)."),
+    output: str = typer.Option(
+        "",
+        help="Output directory used with `--recursive` (default: rewrite files in place) or `--watch` (default: print "
+        "results).",
+    ),
+    import_path: Optional[List[str]] = typer.Option(
+        None,
+        help="Directory searched for the modules imported with `from ... import ...`, whose constants and functions "
+        "are then folded and inlined. Imported modules are parsed, never executed.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        help="With --file, only re-simplify from the first top-level statement changed since the previous run on the "
+        "same file (whose state is kept in the cache directory).",
+    ),
+    max_unroll: Optional[int] = typer.Option(
+        Options().max_unroll, help="Maximum number of loop iterations unrolled; longer loops are left intact."
+    ),
+    time_budget: Optional[float] = typer.Option(None, help="Seconds after which simplification of an input fails."),
+    memory_budget: Optional[int] = typer.Option(
+        Options().memory_budget, help="Bytes of folded constants after which simplification of an input fails."
+    ),
+    max_passes: int = typer.Option(
+        Options().max_passes, help="Maximum number of simplification passes made to reach a fixed point."
+    ),
+    max_inline_depth: int = typer.Option(
+        Options().max_inline_depth, help="Maximum nesting depth of inlined calls; deeper calls are left intact."
+    ),
+    max_inline_nodes: int = typer.Option(
+        Options().max_inline_nodes, help="Maximum size in nodes of the result of inlining a single call."
+    ),
+    max_inline_growth: int = typer.Option(
+        Options().max_inline_growth,
+        help="Maximum number of nodes inlined (or simplified by failed attempts) in each pass.",
+    ),
+    disable_rule: Optional[List[str]] = typer.Option(
+        None, help="Name of a node type (e.g. `For`) whose simplification rule is not applied."
+    ),
+    reassociate: bool = typer.Option(
+        False,
+        help="Assume that chains of `+`, `*`, `&`, `|` and `^` operate on integers, so that their constant operands "
+        "can be combined wherever they appear.",
+    ),
+    eliminate_dead_code: bool = typer.Option(
+        False,
+        help="Keep assignments, removing only the stores to local variables that are never read afterwards and the "
+        "local functions that are never referenced.",
+    ),
+    iterative: bool = typer.Option(
+        False, help="Simplify nested expressions from an explicit stack, so that deeply nested code can be simplified."
+    ),
+    cache_dir: str = typer.Option(str(DEFAULT_CACHE_DIR), help="Directory of the persistent result cache."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the persistent result cache."),
+    profile: bool = typer.Option(False, help="Print per-rule profiling statistics to standard error."),
+    profile_output: str = typer.Option(
+        "", help="Path to which a JSON profiling report is written (implies --profile)."
+    ),
 ):
-    one_of = {"--stdin": stdin, "--source": source, "--file": file, "--module": module}
+    one_of = {
+        "--stdin": stdin,
+        "--stream": stream,
+        "--source": source,
+        "--file": file,
+        "--module": module,
+        "--recursive": recursive,
+        "--watch": watch,
+    }
     if not sum(map(bool, one_of.values())) == 1:
         typer.echo(f"Exactly one of the following must be provided: {', '.join(str(x) for x in one_of)}.", err=True)
-        typer.Exit(code=1)
+        raise typer.Exit(code=1)
+
+    profile = profile or bool(profile_output)
+    if profile and recursive:
+        typer.echo("--profile cannot be combined with --recursive.", err=True)
+        raise typer.Exit(code=1)
+    if profile and (stream or watch):
+        typer.echo(f"--profile cannot be combined with {'--stream' if stream else '--watch'}.", err=True)
+        raise typer.Exit(code=1)
+    if incremental and (not file or no_cache):
+        typer.echo("--incremental requires --file and the cache.", err=True)
+        raise typer.Exit(code=1)
+    if import_path and (incremental or stream or watch):
+        typer.echo("--import-path cannot be combined with --incremental, --stream or --watch.", err=True)
+        raise typer.Exit(code=1)
+    if stream and stream not in ("nul", "jsonl"):
+        typer.echo("--stream must be one of: nul, jsonl.", err=True)
+        raise typer.Exit(code=1)
+
+    unknown_rules = set(disable_rule or []) - RULE_NAMES.keys()
+    if unknown_rules:
+        typer.echo(f"Unknown rules: {', '.join(sorted(unknown_rules))}.", err=True)
+        raise typer.Exit(code=1)
+
+    cache = None if no_cache or profile else ResultCache(cache_dir)
+    resolver = ModuleResolver(import_path, None if no_cache else cache_dir) if import_path else None
+    options = Options(
+        max_unroll=max_unroll,
+        max_passes=max_passes,
+        time_budget=time_budget,
+        memory_budget=memory_budget,
+        max_inline_depth=max_inline_depth,
+        max_inline_nodes=max_inline_nodes,
+        max_inline_growth=max_inline_growth,
+        iterative=iterative,
+        reassociate=reassociate,
+        eliminate_dead_code=eliminate_dead_code,
+        disabled_rules=tuple(disable_rule or ()),
+    )
+
+    if recursive:
+        from simplify.batch import simplify_tree
+
+        results = simplify_tree(
+            recursive,
+            output_dir=output or None,
+            bind_list=bind,
+            jobs=jobs or None,
+            cache=cache,
+            options=options,
+            resolver=resolver,
+        )
+        if cache is not None:
+            cache.evict()
+        failures = [r for r in results if r.error]
+        for r in failures:
+            typer.echo(f"{r.path}: {r.error}", err=True)
+        typer.echo(f"Simplified {len(results) - len(failures)} of {len(results)} files.", err=True)
+        if failures:
+            raise typer.Exit(code=1)
+        return
+
+    if watch:
+        from simplify.watch import Watch
+
+        try:
+            Watch(watch, output or None, bind, options).run()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if stream:
+        from simplify.streaming import simplify_stream
+
+        failures = simplify_stream(sys.stdin.buffer, sys.stdout.buffer, sys.stderr.buffer, stream, bind, cache, options)
+        if cache is not None:
+            cache.evict()
+        if failures:
+            raise typer.Exit(code=1)
+        return
 
     # get source if needed
     if module:
-        obj = load_obj_from_path(module)
-        source = inspect.getsource(obj)
+        # the module is found and read without being imported
+        source, path = find_source(module, sys.path)
+        if resolver is not None:
+            resolver = resolver.with_importer(path)
     elif file:
         source = "".join(file)
+        if resolver is not None:
+            resolver = resolver.with_importer(file.name)
     elif stdin:
-        lines = []
-        while True:
-            try:
-                lines.append(input())
-            except EOFError:
-                break
-        source = "\n".join(lines)
-
-    print(transform_source(source, bind))
+        source = sys.stdin.buffer.read().decode()
+
+    stats = {}
+    if profile:
+        with Profiler() as profiler:
+            print(transform_source(source, bind, cache, options, stats, profiler, resolver=resolver))
+        typer.echo(profiler.summary(), err=True)
+        if profile_output:
+            with open(profile_output, "w") as f:
+                f.write(profiler.to_json())
+    elif incremental:
+        bindings = parse_bindings(bind or [])
+        path = state_path(cache_dir, file.name, bindings, options)
+        session = IncrementalSession.load(path, bindings, options)
+        print(transform_source(source, bind, cache, options, stats, session=session))
+        session.dump(path)
+    else:
+        print(transform_source(source, bind, cache, options, stats, resolver=resolver))
+    if max_passes > 1 and stats:
+        if stats["converged"]:
+            typer.echo(f"Reached a fixed point after {stats['passes']} passes.", err=True)
+        else:
+            typer.echo(f"Stopped after {stats['passes']} passes without reaching a fixed point.", err=True)
+    if cache is not None:
+        cache.evict()
+
+
+def serve(
+    socket: str = typer.Option("", help="Path of a Unix socket to listen on (default: standard input and output)."),
+    cache_size: int = typer.Option(4096, help="Number of results kept in the in-memory cache."),
+):
+    from simplify.server import serve
+
+    serve(socket or None, cache_size)
@@ -0,0 +1,204 @@
+import ast
+import builtins
+import copy
+import hashlib
+import os
+import pickle
+import textwrap
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Sequence, Set, Tuple
+
+from simplify import __version__
+from simplify.exceptions import InvalidPythonPathError
+from simplify.hashing import invalidate
+from simplify.scope import ConstantCell
+from simplify.simplifier import Simplifier
+from simplify.utils import assigned_names, loaded_names
+
+
+def file_hash(path: os.PathLike) -> Optional[str]:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class ModuleSummary(NamedTuple):
+    # values of the names a module exports: constants, and functions that only read their parameters, their locals and
+    # builtins (and write nothing else)
+    names: Dict[str, ast.AST]
+    # builtins read by each exported function, which must not be shadowed where it is inlined
+    free_names: Dict[str, Tuple[str, ...]]
+    # hashes of the contents of the module and of the modules it (transitively) imports, by path
+    dependencies: Dict[str, Optional[str]]
+
+    def is_current(self) -> bool:
+        return all(file_hash(path) == digest for path, digest in self.dependencies.items())
+
+
+def summarize(tree: ast.Module, simp: Simplifier) -> Tuple[Dict[str, ast.AST], Dict[str, Tuple[str, ...]]]:
+    # `simp` has simplified `tree`, so its global scope holds the values of the names bound when the module is executed
+    mutable = {name for node in ast.walk(tree) if isinstance(node, ast.Global) for name in node.names}
+    # decorated functions and functions writing to enclosing scopes, as defined in the source (their simplified
+    # definitions no longer show it)
+    unsafe = {
+        node.name
+        for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef)
+        and (node.decorator_list or any(isinstance(n, (ast.Global, ast.Nonlocal)) for n in ast.walk(node)))
+    }
+    module_names = assigned_names([tree])
+    names = {}
+    free_names = {}
+    for name, value in simp.global_scope.values.items():
+        if name in mutable or "." in name:
+            continue
+        match value:
+            case ConstantCell():
+                names[name] = value.node
+            case ast.Constant():
+                names[name] = value
+            case ast.FunctionDef() if name not in unsafe:
+                args = value.args
+                local_names = assigned_names(value.body) | {
+                    a.arg for a in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg] if a
+                }
+                # attributes of free names are read from the names themselves
+                free = {n for n in set().union(*map(loaded_names, value.body)) - local_names if "." not in n}
+                if all(n in builtins.__dict__ and n not in module_names for n in free):
+                    names[name] = value
+                    free_names[name] = tuple(sorted(free))
+    return names, free_names
+
+
+# Resolves `from ... import ...` statements statically: imported modules found under the search path are parsed and
+# simplified (never executed), and the constants and inlinable functions they export are summarized. Summaries are
+# computed once per process and kept on disk under `cache_dir`, keyed on the path and contents of the module and
+# checked against the contents of its dependencies.
+class ModuleResolver:
+    def __init__(
+        self,
+        search_path: Sequence[os.PathLike],
+        cache_dir: Optional[os.PathLike] = None,
+        importer: Optional[os.PathLike] = None,
+    ):
+        self.search_path = [Path(p).resolve() for p in search_path]
+        self.cache_dir = None if cache_dir is None else Path(cache_dir, "summaries")
+        self.importer = None if importer is None else Path(importer).resolve()
+        self.imported: Set[Path] = set()  # modules resolved for the importer
+        self.summaries: Dict[Path, ModuleSummary] = {}
+        self._pending: Set[Path] = set()
+
+    def with_importer(self, importer: Optional[os.PathLike]) -> "ModuleResolver":
+        # resolver of the imports made by the module at `importer`, sharing summaries with this one
+        resolver = copy.copy(self)
+        resolver.importer = None if importer is None else Path(importer).resolve()
+        resolver.imported = set()
+        return resolver
+
+    def find(self, module: Optional[str], level: int = 0) -> Optional[Path]:
+        parts = module.split(".") if module else []
+        if not parts and not level:
+            return None
+        if level:
+            if self.importer is None:
+                return None
+            roots = [self.importer.parents[level - 1]] if level <= len(self.importer.parents) else []
+        else:
+            roots = self.search_path
+        for root in roots:
+            base = root.joinpath(*parts)
+            for path in (base.with_suffix(".py") if parts else None, base / "__init__.py"):
+                if path is not None and path.is_file():
+                    return path
+        return None
+
+    def summary(self, path: Path) -> ModuleSummary:
+        summary = self.summaries.get(path)
+        if summary is not None:
+            return summary
+        if path in self._pending:  # import cycle: the names of the module are not known yet
+            return ModuleSummary({}, {}, {})
+
+        digest = file_hash(path)
+        cache_path = None
+        if self.cache_dir is not None and digest is not None:
+            key = hashlib.sha256(f"{__version__}\0{self.search_path}\0{path}\0{digest}".encode()).hexdigest()
+            cache_path = self.cache_dir / key
+            try:
+                summary = pickle.loads(cache_path.read_bytes())
+            except Exception:  # missing, or written by an incompatible version
+                summary = None
+            if isinstance(summary, ModuleSummary) and summary.is_current():
+                self.summaries[path] = summary
+                return summary
+
+        self._pending.add(path)
+        try:
+            summary = self._summarize(path, digest)
+        finally:
+            self._pending.discard(path)
+        self.summaries[path] = summary
+        if cache_path is not None:
+            for node in summary.names.values():
+                invalidate(node)  # structural hashes are not stable across processes
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(pickle.dumps(summary))
+            os.replace(tmp_path, cache_path)
+        return summary
+
+    def _summarize(self, path: Path, digest: Optional[str]) -> ModuleSummary:
+        dependencies = {str(path): digest}
+        resolver = self.with_importer(path)
+        try:
+            tree = ast.parse(path.read_text())
+            simp = Simplifier(resolver=resolver)
+            simp.track_bindings(tree)
+            simp.visit(tree)
+        except Exception:  # modules that cannot be simplified export nothing
+            return ModuleSummary({}, {}, dependencies)
+        for imported in resolver.imported:
+            dependencies.update(self.summaries[imported].dependencies if imported in self.summaries else {})
+        return ModuleSummary(*summarize(tree, simp), dependencies)
+
+    def resolve(self, node: ast.ImportFrom) -> Optional[ModuleSummary]:
+        path = self.find(node.module, node.level)
+        if path is None:
+            return None
+        self.imported.add(path)
+        return self.summary(path)
+
+    def fingerprint(self, tree: ast.Module) -> str:
+        # identifies the contents of all the modules whose summaries the simplification of `tree` may use
+        dependencies = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom):
+                summary = self.resolve(node)
+                if summary is not None:
+                    dependencies.update(summary.dependencies)
+        return repr(sorted(dependencies.items()))
+
+
+# Source of the module or of the top-level definition designated by `python_path` (of the form `module_path:obj_name`),
+# found under `search_path` without importing the module.
+def find_source(python_path: str, search_path: Sequence[os.PathLike]) -> Tuple[str, Path]:
+    split_path = python_path.split(":")
+    if not 1 <= len(split_path) <= 2:
+        raise InvalidPythonPathError(python_path, "Path must have form module_path:callable_obj.")
+    module_path = split_path[0]
+    path = ModuleResolver(search_path).find(module_path)
+    if path is None:
+        raise InvalidPythonPathError(python_path, f"Module {module_path} not found.")
+    source = path.read_text()
+    if len(split_path) < 2:
+        return source, path
+
+    obj_name = split_path[1]
+    for node in ast.parse(source).body:
+        match node:
+            case ast.FunctionDef(name) | ast.AsyncFunctionDef(name) | ast.ClassDef(name) if name == obj_name:
+                start = min([node.lineno, *(d.lineno for d in node.decorator_list)])
+                lines = source.splitlines(keepends=True)[start - 1 : node.end_lineno]
+                return textwrap.dedent("".join(lines)), path
+    raise InvalidPythonPathError(python_path, f"Object {obj_name} not found in module {module_path}.")
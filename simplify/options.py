@@ -0,0 +1,17 @@
+from typing import NamedTuple, Optional, Tuple
+
+
+class Options(NamedTuple):
+    max_unroll: Optional[int] = 1000  # maximum number of iterations unrolled per loop (`None` for no limit)
+    max_passes: int = 1  # maximum number of passes made by `simplify_to_fixed_point`
+    max_int_bits: int = 4096  # integer constants are not folded into results larger than this
+    max_sequence_length: int = 100_000  # string, bytes and tuple constants are not folded into longer results
+    time_budget: Optional[float] = None  # seconds after which simplification is aborted
+    memory_budget: Optional[int] = 64 * 2**20  # bytes of folded constants after which simplification is aborted
+    max_inline_depth: int = 16  # calls nested deeper than this in inlined bodies are not inlined
+    max_inline_nodes: int = 1000  # calls whose inlined result has more nodes than this are not inlined
+    max_inline_growth: int = 100_000  # nodes inlined (or simplified by failed attempts) per pass before inlining stops
+    iterative: bool = False  # simplify operands of expressions from an explicit stack rather than recursively
+    reassociate: bool = False  # assume chains of `+`, `*`, `&`, `|` and `^` are on integers, combining their constants
+    eliminate_dead_code: bool = False  # keep stores, removing those that are dead afterwards (see `simplify.liveness`)
+    disabled_rules: Tuple[str, ...] = ()  # names of the node types (e.g. `"For"`) whose rules are not applied
@@ -0,0 +1,106 @@
+import ast
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from simplify.utils import count_nodes
+
+
+class RuleStats:
+    __slots__ = ("calls", "total_time", "self_time", "nodes_in", "nodes_out", "allocated")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0  # excludes recursive calls to the same rule
+        self.self_time = 0.0  # excludes calls to all other rules
+        self.nodes_in = 0
+        self.nodes_out = 0
+        self.allocated = 0  # net bytes allocated, as traced by `tracemalloc`
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+
+# Records per-rule statistics of the simplifiers it instruments. Instrumentation replaces the rules and the
+# `generic_visit` method of a simplifier instance by wrappers, so that simplifiers which are not profiled pay nothing.
+class Profiler:
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stats: Dict[str, RuleStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._child_times: List[float] = []
+        self._active: Dict[str, int] = {}
+
+    def __enter__(self) -> "Profiler":
+        if self.trace_memory:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def instrument(self, simp: ast.NodeTransformer):
+        simp.generic_visit = self.wrap("generic_visit", simp.generic_visit)
+        for node_type, rule in simp.rules.items():
+            simp.rules[node_type] = self.wrap(f"visit_{node_type.__name__}", rule)
+
+    def wrap(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        stats = self.stats.setdefault(name, RuleStats())
+
+        def wrapper(node, *args):
+            tracing = tracemalloc.is_tracing()
+            nodes_in = count_nodes(node)
+            self._child_times.append(0.0)
+            self._active[name] = self._active.get(name, 0) + 1
+            allocated = tracemalloc.get_traced_memory()[0] if tracing else 0
+            start = time.perf_counter()
+            try:
+                result = fn(node, *args)
+            finally:
+                elapsed = time.perf_counter() - start
+                if tracing:
+                    stats.allocated += tracemalloc.get_traced_memory()[0] - allocated
+                self._active[name] -= 1
+                child_time = self._child_times.pop()
+                if self._child_times:
+                    self._child_times[-1] += elapsed
+                stats.calls += 1
+                stats.self_time += elapsed - child_time
+                if not self._active[name]:
+                    stats.total_time += elapsed
+            stats.nodes_in += nodes_in
+            stats.nodes_out += count_nodes(result)
+            return result
+
+        return wrapper
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "rules": {name: stats.as_dict() for name, stats in self.stats.items() if stats.calls},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=2)
+
+    def summary(self) -> str:
+        header = f"{'rule':<24} {'calls':>8} {'total (ms)':>11} {'self (ms)':>10} {'nodes in':>9} {'nodes out':>9}"
+        if self.trace_memory:
+            header += f" {'allocated':>14}"
+        lines = [header, "-" * len(header)]
+        rows = sorted(self.report()["rules"].items(), key=lambda item: -item[1]["self_time"])
+        for name, s in rows:
+            lines.append(
+                f"{name:<24} {s['calls']:>8} {s['total_time'] * 1e3:>11.2f} {s['self_time'] * 1e3:>10.2f} "
+                f"{s['nodes_in']:>9} {s['nodes_out']:>9}"
+            )
+            if self.trace_memory:
+                lines[-1] += f" {s['allocated'] / 1024:>10.1f} KiB"
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
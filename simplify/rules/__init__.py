@@ -0,0 +1,47 @@
+import ast
+from typing import TYPE_CHECKING, Any, Callable, Dict, Type
+
+from simplify.rules import control_flow, expressions, function_and_class_defs, statements, variables
+
+if TYPE_CHECKING:
+    from simplify.simplifier import Simplifier
+else:
+    Simplifier = "Simplifier"
+
+Rule = Callable[[Any, Simplifier], Any]
+
+# The rule applied to each type of node. Nodes of other types are simplified by `Simplifier.generic_visit`.
+DEFAULT_RULES: Dict[Type[ast.AST], Rule] = {
+    # CONTROL FLOW #
+    ast.If: control_flow.visit_if,
+    ast.For: control_flow.visit_for,
+    ast.While: control_flow.visit_while,
+    # EXPRESSIONS #
+    ast.BoolOp: expressions.visit_bool_op,
+    ast.BinOp: expressions.visit_bin_op,
+    ast.IfExp: expressions.visit_if_exp,
+    ast.Compare: expressions.visit_compare,
+    ast.Call: expressions.visit_call,
+    ast.UnaryOp: expressions.visit_unary_op,
+    ast.ListComp: expressions.visit_comprehension,
+    ast.SetComp: expressions.visit_comprehension,
+    ast.DictComp: expressions.visit_comprehension,
+    ast.GeneratorExp: expressions.visit_comprehension,
+    # FUNCTION AND CLASS DEFINITIONS #
+    ast.FunctionDef: function_and_class_defs.visit_function_def,
+    ast.Lambda: function_and_class_defs.visit_lambda,
+    ast.Global: function_and_class_defs.visit_global,
+    ast.Return: function_and_class_defs.visit_return,
+    # STATEMENTS #
+    ast.Assert: statements.visit_assert,
+    ast.Delete: statements.visit_delete,
+    ast.Assign: statements.visit_assign,
+    ast.AugAssign: statements.visit_aug_assign,
+    ast.Import: statements.visit_import,
+    ast.ImportFrom: statements.visit_import_from,
+    # VARIABLES #
+    ast.Attribute: variables.visit_attribute,
+    ast.Name: variables.visit_name,
+}
+
+RULE_NAMES: Dict[str, Type[ast.AST]] = {node_type.__name__: node_type for node_type in DEFAULT_RULES}
@@ -1,15 +1,22 @@
 import ast
-from copy import deepcopy
-from typing import TYPE_CHECKING
-
-from simplify.utils import unpack
+import sys
+from typing import TYPE_CHECKING, List, Optional, Tuple, Type
 
+from simplify.iteration import Bindings, iteration_limit, iterations
+from simplify.scope import is_reference
+from simplify.utils import assigned_names, unpack
 
 if TYPE_CHECKING:
     from simplify.simplifier import Simplifier
 else:
     Simplifier = "Simplifier"
 
+# statements leaving a loop, and statements whose control flow may depend on a condition (see `is_straight_line`)
+EXITS = (ast.Return, ast.Raise)
+BRANCHES = (ast.If, ast.Try, ast.Match, ast.Break, ast.Continue)
+if sys.version_info >= (3, 11):
+    BRANCHES += (ast.TryStar,)
+
 
 def visit_if(node: ast.If, simp: Simplifier):
     test, body, orelse = unpack(node)
@@ -24,20 +31,148 @@ def visit_if(node: ast.If, simp: Simplifier):
 
 
 def visit_for(node: ast.For, simp: Simplifier):
-    target, iter_, body, *_ = unpack(node)  # TODO: orelse
-    target = simp.visit(target)
+    target, iter_, body, orelse, _ = unpack(node)
     iter_ = simp.visit(iter_)
-    body = simp.visit(body)
-    match (target, iter_):
-        case (ast.Name(id), ast.List(elts)):
-            result = []
-            for e in elts:
-                match e:
-                    case ast.Constant(value):
-                        simp.scope[id] = ast.Constant(value)
-                        result.extend(simp.visit(deepcopy(body)))
-                    case _:
-                        if id in simp.scope:
-                            del simp.scope[id]
-                        return node  # TODO
+    steps = None if has_jump(body) else iterations(target, iter_, simp)
+    if steps is not None:
+        state = checkpoint(simp)
+        result = unroll(steps, body, orelse, simp)
+        if result is not None:
             return result
+        rollback(simp, state)
+    return keep_loop(replace_loop(node, iter_), simp)
+
+
+# The statements left by the iterations of a for loop binding its target to each of `steps`, unless a branch of the
+# body could not be decided (the bindings of the scope would then depend on the branch taken, see `is_straight_line`).
+def unroll(steps: List[Bindings], body: list, orelse: list, simp: Simplifier) -> Optional[list]:
+    result = []
+    for bindings in steps:
+        for name, value in bindings:
+            simp.scope[name] = value
+            if simp.options.eliminate_dead_code:
+                result.append(ast.Assign([ast.Name(name, ast.Store())], value))
+        # `body` is shared by all iterations: simplifying it is copy-on-write, so only the subtrees that change
+        # (e.g. by substituting the loop variable) are copied
+        statements = simp.visit(body)
+        # statements after a `return` are not executed, so the bindings they make do not matter
+        if not all(isinstance(stmt, ast.Return) or is_straight_line(stmt) for stmt in statements):
+            return None
+        for i, stmt in enumerate(statements):
+            if isinstance(stmt, ast.Return):
+                # neither the remaining iterations nor the `else` clause are executed
+                result.extend(statements[: i + 1])
+                return result
+        result.extend(statements)
+    # the loop completes without `break`, so its `else` clause is executed
+    result.extend(simp.visit(orelse))
+    return result
+
+
+# A while loop is executed symbolically, one iteration at a time against the bindings of the scope, for as long as its
+# condition simplifies to a constant and its body leaves no branch undecided. The iterations are then unrolled (most
+# statements vanish into the scope, leaving the final state) up to `iteration_limit` iterations. Otherwise, the scopes
+# are rolled back to their state before the loop, which is kept.
+def visit_while(node: ast.While, simp: Simplifier):
+    test, body, orelse = unpack(node)
+    state = checkpoint(simp)
+    result = []
+    for _ in range(iteration_limit(simp.options) + 1):
+        match simp.visit(test):
+            case ast.Constant(value) if not value:
+                # the loop completes without `break`, so its `else` clause is executed
+                result.extend(simp.visit(orelse))
+                return result
+            case ast.Constant():
+                iteration = run_iteration(body, simp)
+                if iteration is None:
+                    break
+                statements, jump = iteration
+                result.extend(statements)
+                if jump in (ast.Break, ast.Return):
+                    return result
+            case _:
+                break
+    rollback(simp, state)
+    return keep_loop(node, simp)
+
+
+# The state of the simplifier that unrolling a loop changes, to roll back to if the loop is kept.
+def checkpoint(simp: Simplifier) -> tuple:
+    scopes = [simp.scope] if simp.scope.is_global else [simp.scope, simp.global_scope]
+    return [(scope, scope.snapshot()) for scope in scopes], simp.folded_bytes, simp.inlined_nodes
+
+
+def rollback(simp: Simplifier, state: tuple):
+    snapshots, simp.folded_bytes, simp.inlined_nodes = state
+    for scope, snapshot in snapshots:
+        scope.restore(snapshot)
+
+
+# The statements left by simplifying one iteration of `body`, and the jump (`break`, `continue` or `return`) that ended
+# it, if any. Statements after a jump are not simplified, since they are not executed.
+def run_iteration(body: list, simp: Simplifier) -> Optional[Tuple[list, Optional[Type[ast.stmt]]]]:
+    result = []
+    for stmt in body:
+        output = simp.visit(stmt)
+        output = [] if output is None else output if isinstance(output, list) else [output]
+        for i, out in enumerate(output):
+            if isinstance(out, (ast.Break, ast.Continue, ast.Return)) and i == len(output) - 1:
+                return [*result, out] if isinstance(out, ast.Return) else result, type(out)
+            if not is_straight_line(out):
+                return None
+            result.append(out)
+    return result, None
+
+
+# Whether control flows through `stmt` to the next statement, without branching on a condition that could not be
+# decided (the bindings of the scope would then depend on the branch taken) or leaving the loop.
+def is_straight_line(stmt: ast.stmt) -> bool:
+    # names assigned in kept loops are forgotten by `keep_loop`, and their jumps only apply to themselves
+    excluded = EXITS if isinstance(stmt, (ast.For, ast.AsyncFor, ast.While)) else EXITS + BRANCHES
+    return not any(isinstance(node, excluded) for node in ast.walk(stmt))
+
+
+def replace_loop(node: ast.For, iter_: ast.expr) -> ast.For:
+    if iter_ is node.iter:
+        return node
+    return ast.For(node.target, iter_, node.body, node.orelse, node.type_comment)
+
+
+def has_jump(body: list) -> bool:
+    for stmt in body:
+        for node in ast.walk(stmt):
+            # jumps inside nested loops are harmless but rare enough not to be worth distinguishing
+            if isinstance(node, (ast.Break, ast.Continue)):
+                return True
+    return False
+
+
+def keep_loop(node: ast.For | ast.While, simp: Simplifier) -> list:
+    # Names assigned in the loop may change from one iteration to the next, so their current local values are
+    # materialized before the loop, and the names are forgotten (masking the bindings of enclosing scopes). The loop is
+    # then simplified against the remaining bindings, which are loop-invariant, keeping its stores. Names bound to
+    # definitions (e.g. of functions) are not materialized, since definitions are not expressions (and are kept in the
+    # output where they are made).
+    loop_names = assigned_names([node])
+    prelude = []
+    for name in sorted(loop_names):
+        if simp.scope.binds(name) and "." not in name:
+            value = simp.scope[name]
+            if not isinstance(value, ast.stmt) and not is_reference(value, name):
+                prelude.append(ast.Assign([ast.Name(name, ast.Store())], value))
+        simp.scope.discard(name)
+    options = simp.options
+    simp.options = options._replace(eliminate_dead_code=True)
+    try:
+        match node:
+            case ast.For(target, iter_, body, orelse, type_comment):
+                loop = ast.For(target, iter_, simp.visit(body) or [ast.Pass()], simp.visit(orelse), type_comment)
+            case ast.While(test, body, orelse):
+                loop = ast.While(simp.visit(test), simp.visit(body) or [ast.Pass()], simp.visit(orelse))
+    finally:
+        simp.options = options
+    # the bindings made by the body only hold if it was executed
+    for name in loop_names:
+        simp.scope.discard(name)
+    return [*prelude, loop]
@@ -1,10 +1,22 @@
 import ast
 import functools
-from typing import TYPE_CHECKING
-
-from simplify.bindings import get_bindings
-from simplify.data import BIN_OPS, CMP_OPS, UNARY_OPS
-from simplify.utils import split_list_on_predicate, unpack
+from typing import TYPE_CHECKING, Callable, Optional
+
+from simplify.data import BIN_OPS, CMP_OPS, ITERABLE_CONSUMERS, PURE_FUNCTIONS, UNARY_OPS
+from simplify.folding import (
+    CannotFold,
+    build_chain,
+    called_function,
+    chain_operands,
+    charge,
+    check_bin_op,
+    evaluate,
+    fold_call,
+    fold_values,
+)
+from simplify.iteration import comprehension_values
+from simplify.inlining import can_inline, charge as charge_inlined, inline_frame, inline_function
+from simplify.utils import assigned_names, replace, split_list_on_predicate, unpack
 
 if TYPE_CHECKING:
     from simplify.simplifier import Simplifier
@@ -13,16 +25,71 @@ else:
 
 
 def visit_bin_op(node: ast.BinOp, simp: Simplifier):
-    node = super(type(simp), simp).generic_visit(node)
+    operands = chain_operands(node)
+    if len(operands) > 2:
+        return visit_chain(node, operands, simp)
+    node = simp.generic_visit(node)
     match node:
         case ast.BinOp(ast.Constant(lval), op, ast.Constant(rval)):
-            return ast.Constant(BIN_OPS[type(op)](lval, rval))
+            try:
+                check_bin_op(op, lval, rval, simp.options)
+                value = evaluate(BIN_OPS[type(op)], lval, rval)
+            except CannotFold:
+                return node
+            charge(simp, value)
+            return simp.interner.constant(value)
         case ast.BinOp(_):
             return node
 
 
+# Simplifies a chain of an associative operator in a single pass over its operands, without recursing along the chain.
+# The longest run of leading constants is folded (later constants cannot be, since e.g. `x + 1 + 2` is `(x + 1) + 2`),
+# unless `Options.reassociate` allows integer constants to be combined wherever they appear.
+def visit_chain(node: ast.BinOp, operands: list, simp: Simplifier):
+    op = node.op
+    values = simp.visit(operands)
+    changed = any(new is not old for new, old in zip(values, operands))
+
+    reassociate = simp.options.reassociate
+    if reassociate:
+        ints = [v.value for v in values if isinstance(v, ast.Constant) and type(v.value) is int]
+        if len(ints) > 1:
+            try:
+                folded = fold_values(op, ints, simp.options)
+            except CannotFold:
+                pass
+            else:
+                charge(simp, folded)
+                values = [v for v in values if not (isinstance(v, ast.Constant) and type(v.value) is int)]
+                values.append(simp.interner.constant(folded))
+                changed = True
+
+    n = 0
+    while n < len(values) and isinstance(values[n], ast.Constant):
+        n += 1
+    if n > 1:
+        try:
+            folded = fold_values(op, [v.value for v in values[:n]], simp.options)
+        except CannotFold:
+            pass
+        else:
+            charge(simp, folded)
+            values = [simp.interner.constant(folded), *values[n:]]
+            changed = True
+
+    if not changed:
+        return node
+    return build_chain(op, values, balanced=reassociate)
+
+
 def visit_bool_op(node: ast.BoolOp, simp: Simplifier):
-    node = super(type(simp), simp).generic_visit(node)
+    node = simp.generic_visit(node)
+    if any(isinstance(v, ast.BoolOp) and type(v.op) is type(node.op) for v in node.values):
+        # `and` and `or` are associative: nested operations of the same operator (e.g. after substitution) are merged
+        values = []
+        for v in node.values:
+            values.extend(v.values if isinstance(v, ast.BoolOp) and type(v.op) is type(node.op) else [v])
+        node = ast.BoolOp(node.op, values)
     match node:
         case ast.BoolOp(_, []):
             return node
@@ -32,23 +99,23 @@ def visit_bool_op(node: ast.BoolOp, simp: Simplifier):
             reduced_const_value = functools.reduce(lambda x, y: x and y, map(lambda v: v.value, const_values), True)
             if not non_const_values:
                 # Expression has been fully evaluated
-                return ast.Constant(reduced_const_value)
+                return simp.interner.constant(reduced_const_value)
             elif reduced_const_value:
                 # Remove redundant `True` from `and`
                 return ast.BoolOp(node.op, non_const_values)
             else:
                 # Short-circuit evaluation
-                return ast.Constant(False)
+                return simp.interner.constant(False)
         case ast.BoolOp(ast.Or(), values):
             const_values, non_const_values = split_list_on_predicate(values, lambda x: isinstance(x, ast.Constant))
 
             reduced_const_value = functools.reduce(lambda x, y: x or y, map(lambda v: v.value, const_values), False)
             if not non_const_values:
                 # Expression has been fully evaluated
-                return ast.Constant(reduced_const_value)
+                return simp.interner.constant(reduced_const_value)
             elif reduced_const_value:
                 # Short-circuit evaluation
-                return ast.Constant(True)
+                return simp.interner.constant(True)
             else:
                 # Remove redundant `False` from `or`
                 return ast.BoolOp(node.op, non_const_values)
@@ -62,9 +129,12 @@ def visit_compare(node: ast.Compare, simp: Simplifier):
         case ast.Compare(ast.Constant(value), ops, [*comps]) if all(isinstance(c, ast.Constant) for c in comps):
             result = True
             right_vals = [c.value for c in comps]
-            for left, op, right in zip([value] + right_vals, ops, right_vals):
-                result = result and CMP_OPS[type(op)](left, right)
-            return ast.Constant(result)
+            try:
+                for left, op, right in zip([value] + right_vals, ops, right_vals):
+                    result = result and evaluate(CMP_OPS[type(op)], left, right)
+            except CannotFold:
+                return node
+            return simp.interner.constant(result)
         case ast.Compare(_):
             return node
 
@@ -72,24 +142,85 @@ def visit_compare(node: ast.Compare, simp: Simplifier):
 def visit_call(node: ast.Call, simp: Simplifier):
     # TODO: Inline calls (look up node.func.id in self.scope)
     # TODO: Partial evaluation of calls
-    func, call_args, _ = unpack(node)
+    func, call_args, keywords = unpack(node)
     call_args = simp.visit(call_args)
     match func:
         # simplest case
-        case ast.Lambda(ast.arguments(args=lambda_args), body) if len(lambda_args) == len(call_args):
+        case ast.Lambda(ast.arguments(args=lambda_args), body) if len(lambda_args) == len(call_args) and can_inline(
+            simp
+        ):
             with simp.new_scope({lbd_arg.arg: cl_arg for lbd_arg, cl_arg in zip(lambda_args, call_args)}):
-                return simp.visit(body)
-        case ast.Name(name, ast.Load()) if name in simp.scope:
-            fn_def = simp.scope[name]
-            match fn_def:
-                case ast.FunctionDef(_, _, body):
-                    bindings = get_bindings(fn_def.args, node)
-                    with simp.new_scope(bindings):
-                        body = simp.visit(fn_def.body)
-                        match body:
-                            case [ast.Return(value), *_]:
-                                return simp.visit(value)
-    return super(type(simp), simp).generic_visit(node)
+                with inline_frame(simp):
+                    result = charge_inlined(simp, simp.visit(body))
+                if result is not None:
+                    return result
+        case ast.Name(name, ast.Load()):
+            match simp.scope.get(name):
+                case ast.FunctionDef() as fn_def:
+                    result = inline_function(fn_def, replace(node, args=call_args), simp)
+                    if result is not None:
+                        return result
+    func = simp.visit(func)
+    keywords = simp.visit(keywords)
+    fn = pure_function(func, simp)
+    if fn is not None:
+        if fn in ITERABLE_CONSUMERS:
+            call_args = [materialize_generator(arg, simp) for arg in call_args]
+        try:
+            value = fold_call(fn, call_args, keywords, simp.options)
+        except CannotFold:
+            pass
+        else:
+            charge(simp, value)
+            return simp.interner.constant(value)
+    if func is node.func and call_args == node.args and keywords == node.keywords:
+        return node
+    return replace(node, func=func, args=call_args, keywords=keywords)
+
+
+def pure_function(func: ast.expr, simp: Simplifier) -> Optional[Callable]:
+    name = called_function(func, simp)
+    return None if name is None else PURE_FUNCTIONS.get(name)
+
+
+# Comprehensions over finite iterables of constants whose elements simplify to constants are folded into literals.
+# Generator expressions are only folded where they are consumed at once (see `materialize_generator`).
+def visit_comprehension(node: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp, simp: Simplifier):
+    values = None if isinstance(node, ast.GeneratorExp) else comprehension_values(node, simp)
+    match node:
+        case ast.ListComp() if values is not None:
+            return ast.List([simp.interner.constant(v) for v in values], ast.Load())
+        case ast.SetComp() if values:  # there is no literal for the empty set
+            return ast.Set([simp.interner.constant(v) for v in dict.fromkeys(values)])
+        case ast.DictComp() if values is not None:
+            items = dict(values)
+            keys = [simp.interner.constant(k) for k in items]
+            return ast.Dict(keys, [simp.interner.constant(v) for v in items.values()])
+
+    # the targets of the comprehension are local to it and shadow the enclosing bindings of their names, except in the
+    # first iterable, which is evaluated in the enclosing scope
+    generators = node.generators
+    first_iter = simp.visit(generators[0].iter)
+    names = assigned_names(g.target for g in generators)
+    with simp.new_scope({name: ast.Name(name, ast.Load()) for name in names if "." not in name}):
+        generators = [
+            replace(g, iter=first_iter if i == 0 else simp.visit(g.iter), ifs=simp.visit(g.ifs))
+            for i, g in enumerate(generators)
+        ]
+        if isinstance(node, ast.DictComp):
+            return replace(node, key=simp.visit(node.key), value=simp.visit(node.value), generators=generators)
+        return replace(node, elt=simp.visit(node.elt), generators=generators)
+
+
+# A generator expression passed to a pure function consuming its argument at once (e.g. `sum`) is replaced by the tuple
+# of its elements, so that the call can be evaluated.
+def materialize_generator(node: ast.expr, simp: Simplifier) -> ast.expr:
+    if not isinstance(node, ast.GeneratorExp):
+        return node
+    values = comprehension_values(node, simp)
+    if values is None:
+        return node
+    return ast.Tuple([simp.interner.constant(v) for v in values], ast.Load())
 
 
 def visit_if_exp(node: ast.IfExp, simp: Simplifier):
@@ -108,5 +239,8 @@ def visit_unary_op(node: ast.UnaryOp, simp: Simplifier):
     op, operand = unpack(node)
     operand = simp.visit(operand)
     if isinstance(operand, ast.Constant):
-        return ast.Constant(UNARY_OPS[type(op)](operand.value))
+        try:
+            return simp.interner.constant(evaluate(UNARY_OPS[type(op)], operand.value))
+        except CannotFold:
+            pass
     return ast.UnaryOp(op, operand)
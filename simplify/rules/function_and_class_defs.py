@@ -1,7 +1,8 @@
 import ast
 from typing import TYPE_CHECKING
 
-from simplify.utils import unpack
+from simplify.scope import reference
+from simplify.utils import parameter_names, replace, unpack
 
 if TYPE_CHECKING:
     from simplify.simplifier import Simplifier
@@ -12,12 +13,31 @@ else:
 def visit_function_def(node: ast.FunctionDef, simp: Simplifier):
     # TODO: Add decorators, etc.
     # TODO: Check if return value can be extracted
-    with simp.new_scope():
-        result = super(type(simp), simp).generic_visit(node)  # must be visited in the function's local scope
+    # defaults, annotations and decorators are evaluated where the function is defined, and its body in its local
+    # scope, where the parameters mask the bindings of their names
+    args = simp.visit(node.args)
+    with simp.new_scope(parameters(args)):
+        body = simp.visit(node.body)
+    decorator_list, returns = simp.visit(node.decorator_list), simp.visit(node.returns)
+    result = replace(node, args=args, body=body, decorator_list=decorator_list, returns=returns)
+    match simp.scope.get(node.name):
+        case ast.FunctionDef() as previous:
+            simp.inline_cache.discard(previous)
     simp.scope[node.name] = result  # must be assigned in the scope enclosing the function
     return result
 
 
+def visit_lambda(node: ast.Lambda, simp: Simplifier):
+    args, body = unpack(node)
+    args = simp.visit(args)
+    with simp.new_scope(parameters(args)):
+        return ast.Lambda(args, simp.visit(body))
+
+
+def parameters(args: ast.arguments) -> dict:
+    return {name: reference(name) for name in parameter_names(args)}
+
+
 def visit_global(node: ast.Global, simp: Simplifier):
     (names,) = unpack(node)
     simp.scope.add_global(*names)
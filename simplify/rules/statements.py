@@ -1,9 +1,11 @@
 import ast
 from typing import TYPE_CHECKING
 
+from simplify.data import PURE_MODULES
+from simplify.liveness import is_duplicable
+from simplify.scope import is_reference
 from simplify.utils import unpack
 
-
 if TYPE_CHECKING:
     from simplify.simplifier import Simplifier
 else:
@@ -20,7 +22,7 @@ def visit_assert(node: ast.Assert, simp: Simplifier):
         case ast.Constant(False):
             return ast.Raise(ast.Call(ast.Name("AssertionError", ast.Load()), [msg], []))
         case _:
-            return node
+            return ast.Assert(test, msg)
 
 
 def visit_aug_assign(node: ast.AugAssign, simp: Simplifier):
@@ -31,9 +33,15 @@ def visit_aug_assign(node: ast.AugAssign, simp: Simplifier):
             name = id
         case ast.Attribute(ast.Name(id), attr) if f"{id}.{attr}" in simp.scope:
             name = f"{id}.{attr}"
-    if not name:
-        return node  # TODO
-    simp.scope[name] = simp.visit(ast.BinOp(simp.scope[name], op, simp.visit(value)))
+    # a name masked by `Scope.discard` has no known value (and `x += y` may update `x` in place, unlike `x = x + y`)
+    if not name or is_reference(simp.scope[name], name):
+        # the loads of the statement are still simplified (e.g. names bound by an unrolled loop must be substituted)
+        return ast.AugAssign(simp.visit(target), op, simp.visit(value))
+    value = simp.visit(ast.BinOp(simp.scope[name], op, simp.visit(value)))
+    if not simp.options.eliminate_dead_code:
+        simp.scope[name] = value
+        return None
+    return keep_assign(ast.Assign([target], value), value, simp)
 
 
 # TODO: Substitute RHS expressions (not just constants) into places where LHS appears
@@ -42,6 +50,9 @@ def visit_assign(node: ast.Assign, simp: Simplifier):
     targets, value, _ = unpack(node)
     new_targets = []
     value = simp.visit(value)
+    targets = simp.visit(targets)  # subscripts and attributes of targets load names
+    if simp.options.eliminate_dead_code:
+        return keep_assign(ast.Assign(targets, value), value, simp)
     for t in targets:
         match t:
             case ast.Name(id):
@@ -55,10 +66,29 @@ def visit_assign(node: ast.Assign, simp: Simplifier):
     return None
 
 
+# Stores are kept, to be removed afterwards if they are dead. Values are only substituted for later loads if evaluating
+# them there is equivalent to evaluating them here.
+def keep_assign(node: ast.Assign, value: ast.expr, simp: Simplifier):
+    for t in node.targets:
+        match t:
+            case ast.Name(id):
+                name = id
+            case ast.Attribute(ast.Name(id), attr):
+                name = f"{id}.{attr}"
+            case _:
+                continue
+        if is_duplicable(value):
+            simp.scope[name] = value
+        else:
+            simp.scope.discard(name)
+    return ast.Assign(node.targets, value)
+
+
 def visit_delete(node: ast.Delete, simp: Simplifier):
     new_targets = []
     (targets,) = unpack(node)
-    for t in simp.visit(targets):
+    targets = simp.visit(targets)
+    for t in targets:
         match t:
             case ast.Name(id) if id in simp.scope:
                 del simp.scope[t.id]
@@ -66,6 +96,38 @@ def visit_delete(node: ast.Delete, simp: Simplifier):
                 del simp.scope[name]
             case _:
                 new_targets.append(t)
+    if simp.options.eliminate_dead_code:
+        return ast.Delete(targets)
     if new_targets:
         return ast.Delete(new_targets)
     return None
+
+
+# Names bound to modules of pure functions, or to their functions, are bound to the import itself, so that calls through
+# them can be evaluated (see `visit_call`). Other imported names are unknown.
+def visit_import(node: ast.Import, simp: Simplifier):
+    for alias in node.names:
+        name = alias.asname or alias.name.split(".")[0]
+        if (alias.name if alias.asname else name) in PURE_MODULES:
+            simp.scope[name] = node
+        else:
+            simp.scope.discard(name)
+    return node
+
+
+def visit_import_from(node: ast.ImportFrom, simp: Simplifier):
+    # names bound by the import are resolved statically when a resolver is given
+    summary = simp.resolver.resolve(node) if simp.resolver is not None else None
+    for alias in node.names:
+        if alias.name == "*":
+            continue
+        name = alias.asname or alias.name
+        value = summary.names.get(alias.name) if summary is not None else None
+        # inlined functions read builtins from the scope they are inlined in
+        if value is not None and not any(n in simp.scope for n in summary.free_names.get(alias.name, ())):
+            simp.scope[name] = value
+        elif node.level == 0 and node.module in PURE_MODULES:
+            simp.scope[name] = node
+        else:
+            simp.scope.discard(name)
+    return node
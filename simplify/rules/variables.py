@@ -10,14 +10,17 @@ else:
 def visit_attribute(node: ast.Attribute, simp: Simplifier):
     # TODO: handle `self`, etc.
     match node:
-        case ast.Attribute(ast.Name(id), attr, ast.Load()) if (name := f"{id}.{attr}") in simp.scope:
-            return simp.scope[name]
+        case ast.Attribute(ast.Name(id), attr, ast.Load()):
+            value = simp.scope.get(f"{id}.{attr}", node)
+            return node if isinstance(value, ast.stmt) else value
     return node
 
 
 def visit_name(node: ast.Name, simp: Simplifier):
     match node:
-        case ast.Name(id, ast.Load()) if id in simp.scope:
-            return simp.scope[id]
+        case ast.Name(id, ast.Load()):
+            value = simp.scope.get(id, node)
+            # names bound to definitions (e.g. of functions) are kept, since definitions are not expressions
+            return node if isinstance(value, ast.stmt) else value
         case ast.Name(_):
             return node
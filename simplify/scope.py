@@ -1,7 +1,75 @@
-import copy
-from typing import Optional
+import ast
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional, Tuple
 
-from simplify.utils import eq_nodes
+from simplify.hashing import eq_nodes
+
+MISSING = object()
+
+
+class ConstantCell:
+    # Compact binding of a constant: only the value is kept, and the `ast.Constant` (with its attribute dict and
+    # source positions) is built the first time the binding is substituted into the output.
+    __slots__ = ("value", "_node")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self._node = None
+
+    @property
+    def node(self) -> ast.Constant:
+        if self._node is None:
+            self._node = ast.Constant(self.value)
+        return self._node
+
+    def __reduce__(self):
+        # the materialized node is a cache and is rebuilt on demand
+        return ConstantCell, (self.value,)
+
+
+def compact(val: Any) -> Any:
+    if type(val) is ast.Constant and val.kind is None:
+        return ConstantCell(val.value)
+    return val
+
+
+def materialize(val: Any) -> Any:
+    if type(val) is ConstantCell:
+        return val.node
+    return val
+
+
+def reference(name: str) -> ast.expr:
+    # expression that loads the (possibly dotted) name itself
+    head, *attrs = name.split(".")
+    node = ast.Name(head, ast.Load())
+    for attr in attrs:
+        node = ast.Attribute(node, attr, ast.Load())
+    return node
+
+
+def is_reference(val: Any, name: str) -> bool:
+    return eq_nodes(materialize(val), reference(name))
+
+
+class ScopeView(Mapping):
+    # Read-only view of all bindings visible from a scope; lookups go through the shared index instead of a copy of
+    # every dictionary of the chain.
+
+    def __init__(self, scope: "Scope"):
+        self.scope = scope
+
+    def __getitem__(self, name):
+        val = self.scope.get(name, MISSING)
+        if val is MISSING:
+            raise KeyError(name)
+        return val
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in list(self.scope._index) if name in self.scope)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
 
 class Scope:
@@ -13,6 +81,12 @@ class Scope:
             global_scope = self
         self.global_scope = global_scope
         self.enclosing = enclosing
+        self.depth = enclosing.depth + 1 if enclosing else 0
+
+        # Maps each name to the scopes of the chain that bind it, from outermost to innermost. The index is shared by
+        # all scopes of a chain so that a lookup is a single dictionary probe rather than a walk up `enclosing`. This
+        # requires nested scopes to be closed in LIFO order (see `Simplifier.new_scope`).
+        self._index = enclosing._index if enclosing else {}
 
         self.global_ids = []
         self.values = {}
@@ -24,27 +98,82 @@ class Scope:
     def add_global(self, *names):
         self.global_ids.extend(names)
 
+    def binds(self, name) -> bool:
+        # whether the name is bound by this scope itself, rather than visible from an enclosing one
+        if not self.is_global and name in self.global_ids:
+            return self.global_scope.binds(name)
+        return name in self.values
+
+    def discard(self, name):
+        # Forgets the value of a name. A binding of an enclosing scope must not show through once the name is rebound
+        # locally, so it is masked by binding the name to itself.
+        if not self.is_global and name in self.global_ids:
+            self.global_scope.discard(name)
+        elif not self.is_global and name in self.enclosing:
+            self[name] = reference(name)
+        elif name in self.values:
+            del self[name]
+
+    def close(self):
+        for name in self.values:
+            self._unregister(name)
+
+    def snapshot(self) -> Tuple[dict, list]:
+        # bound values are never mutated in place, so shallow copies capture the state of the scope
+        return dict(self.values), list(self.global_ids)
+
+    def restore(self, snapshot: Tuple[dict, list]):
+        self.close()
+        values, global_ids = snapshot
+        self.values = dict(values)
+        self.global_ids = list(global_ids)
+        for name in self.values:
+            self._register(name)
+
     def del_scope(self, name):
         del self.enclosed[name]
 
-    def flatten(self) -> dict:
-        if not self.enclosing:
-            result = self.values
-        else:
-            result = self.enclosing.flatten()
-            result.update(self.values)
-        return copy.copy(result)
+    def flatten(self) -> ScopeView:
+        return ScopeView(self)
+
+    def get(self, name, default=None) -> Any:
+        scope = self._lookup(name)
+        if scope is None:
+            return default
+        return materialize(scope.values[name])
+
+    def _lookup(self, name) -> Optional["Scope"]:
+        scopes = self._index.get(name)
+        if scopes:
+            # only scopes nested more deeply than this one are skipped, so this usually inspects the last entry only
+            for scope in reversed(scopes):
+                if scope.depth <= self.depth:
+                    return scope
+        return None
+
+    def _register(self, name):
+        scopes = self._index.setdefault(name, [])
+        i = len(scopes)
+        while i and scopes[i - 1].depth > self.depth:
+            i -= 1
+        scopes.insert(i, self)
+
+    def _unregister(self, name):
+        scopes = self._index[name]
+        for i in range(len(scopes) - 1, -1, -1):
+            if scopes[i] is self:
+                del scopes[i]
+                break
+        if not scopes:
+            del self._index[name]
 
     def __contains__(self, name):
-        if name in self.values:
-            return True
-        if self.enclosing:
-            return name in self.enclosing
-        return False
+        return self._lookup(name) is not None
 
     def __delitem__(self, name):
         if name in self.values:
             del self.values[name]
+            self._unregister(name)
         else:
             raise RuntimeError(f"Undefined variable: {name}.")
 
@@ -63,16 +192,15 @@ class Scope:
         return set(self.global_ids) == set(other.global_ids)
 
     def __getitem__(self, name):
-        if name in self.values:
-            return self.values[name]
-        if self.enclosing:
-            return self.enclosing[name]
-        raise RuntimeError(f"Undefined variable: {name}.")
+        val = self.get(name, MISSING)
+        if val is MISSING:
+            raise RuntimeError(f"Undefined variable: {name}.")
+        return val
 
     def __setitem__(self, name, val):
-        if self.is_global:
-            self.values[name] = val
-        elif name in self.global_ids:
+        if not self.is_global and name in self.global_ids:
             self.global_scope[name] = val
-        else:
-            self.values[name] = val
+            return
+        if name not in self.values:
+            self._register(name)
+        self.values[name] = compact(val)
@@ -0,0 +1,126 @@
+import io
+import json
+import os
+import socketserver
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+from simplify.cache import MemoryCache
+from simplify.api import DEEP_RECURSION_LIMIT, transform_source
+from simplify.options import Options
+from simplify.utils import recursion_limit
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SIMPLIFICATION_ERROR = -32000
+
+METHODS = {"transform_source", "ping", "shutdown"}
+
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str, data: Optional[Any] = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+# Serves JSON-RPC 2.0 requests, one JSON document per line. The simplifier stays imported and results are cached in
+# memory for the lifetime of the process, so that each request costs the transformation only.
+class Daemon:
+    def __init__(self, cache_size: int = 4096):
+        self.cache = MemoryCache(cache_size)
+        self.stopped = False
+
+    def transform_source(self, source: str, bind: Optional[list] = None, options: Optional[dict] = None) -> str:
+        try:
+            options = Options(**options) if options else Options()
+        except TypeError as e:
+            raise RequestError(INVALID_PARAMS, str(e)) from e
+        try:
+            return transform_source(source, bind, self.cache, options)
+        except Exception as e:
+            raise RequestError(SIMPLIFICATION_ERROR, str(e), {"type": type(e).__name__}) from e
+
+    def ping(self) -> str:
+        return "pong"
+
+    def shutdown(self) -> None:
+        self.stopped = True
+
+    def dispatch(self, request: Any) -> Any:
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            raise RequestError(INVALID_REQUEST, "Invalid request.")
+        if request["method"] not in METHODS:
+            raise RequestError(METHOD_NOT_FOUND, f"Method not found: {request['method']}.")
+        method = getattr(self, request["method"])
+        params = request.get("params", {})
+        try:
+            return method(*params) if isinstance(params, list) else method(**params)
+        except TypeError as e:
+            raise RequestError(INVALID_PARAMS, str(e)) from e
+
+    def handle(self, line: str) -> Optional[Dict[str, Any]]:
+        request = request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise RequestError(PARSE_ERROR, str(e)) from e
+            if isinstance(request, dict):
+                request_id = request.get("id")
+            result = self.dispatch(request)
+        except RequestError as e:
+            if isinstance(request, dict) and "id" not in request:
+                return None  # notifications are never answered, even when they fail
+            error = {"code": e.code, "message": str(e)}
+            if e.data is not None:
+                error["data"] = e.data
+            return {"jsonrpc": "2.0", "id": request_id, "error": error}
+        if "id" not in request:
+            return None  # notification
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def serve_stream(self, reader: TextIO, writer: TextIO):
+        for line in reader:
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            if response is not None:
+                writer.write(json.dumps(response) + "\n")
+                writer.flush()
+            if self.stopped:
+                break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon: Daemon = self.server.daemon
+        reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+        daemon.serve_stream(reader, writer)
+        if daemon.stopped:
+            self.server.shutdown()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: Daemon):
+        super().__init__(socket_path, _Handler)
+        self.daemon = daemon
+
+
+def serve(socket_path: Optional[str] = None, cache_size: int = 4096):
+    daemon = Daemon(cache_size)
+    if not socket_path:
+        daemon.serve_stream(sys.stdin, sys.stdout)
+        return
+    # Requests are handled concurrently, so the recursion limit needed by iterative mode is raised once for the lifetime
+    # of the server, rather than by each request (which would restore it while other requests still rely on it).
+    with recursion_limit(DEEP_RECURSION_LIMIT), _Server(socket_path, daemon) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
@@ -1,27 +1,165 @@
-from _ast import Attribute
 import ast
+import time
 from contextlib import contextmanager
-from typing import Any, Dict, Iterable, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple, Type, Union
 
+from simplify.exceptions import BudgetExceededError, InvalidRuleError
+from simplify.folding import chain_operands
+from simplify.hashing import Interner
+from simplify.inlining import InlineCache
+from simplify.options import Options
 from simplify.scope import Scope
-from simplify.rules import control_flow, expressions, function_and_class_defs, statements, variables
+from simplify.rules import DEFAULT_RULES, RULE_NAMES, Rule
+from simplify.utils import import_bindings, replace
+
+if TYPE_CHECKING:
+    from simplify.modules import ModuleResolver
+    from simplify.profiling import Profiler
+
+# Children that the rules for these expressions visit first, in order and in the enclosing scope. In iterative mode,
+# they are simplified from an explicit stack before their parents. The branches of a conditional expression are only
+# visited if its test is not constant, but are included so that nested conditionals do not recurse.
+OPERANDS = {
+    ast.BinOp: chain_operands,
+    ast.BoolOp: lambda node: node.values,
+    ast.Call: lambda node: node.args,
+    ast.Compare: lambda node: [node.left, *node.comparators],
+    ast.Dict: lambda node: [*(key for key in node.keys if key is not None), *node.values],
+    ast.IfExp: lambda node: [node.test, node.body, node.orelse],
+    ast.List: lambda node: node.elts,
+    ast.Set: lambda node: node.elts,
+    ast.Starred: lambda node: [node.value],
+    ast.Subscript: lambda node: [node.value, node.slice],
+    ast.Tuple: lambda node: node.elts,
+    ast.UnaryOp: lambda node: [node.operand],
+}
 
 
 class Simplifier(ast.NodeTransformer):
-    def __init__(self, bindings: Optional[dict] = None):
+    def __init__(
+        self,
+        bindings: Optional[dict] = None,
+        options: Optional[Options] = None,
+        profiler: Optional["Profiler"] = None,
+        deadline: Optional[float] = None,
+        rules: Optional[Dict[Type[ast.AST], Rule]] = None,
+        resolver: Optional["ModuleResolver"] = None,
+    ):
+        self.options = options or Options()
+        # nodes are dispatched to rules by looking up their exact type in this table
+        self.rules: Dict[Type[ast.AST], Rule] = dict(DEFAULT_RULES if rules is None else rules)
+        for name in self.options.disabled_rules:
+            self.disable(name)
+        if deadline is None and self.options.time_budget is not None:
+            deadline = time.monotonic() + self.options.time_budget
+        self.deadline = deadline
+        self.folded_bytes = 0
+        self.profiler = profiler
+        self.resolver = resolver  # resolves `from ... import ...` statically (see `simplify.modules`)
+        if profiler is not None:
+            profiler.instrument(self)
+        self.interner = Interner()
+        self.inline_cache = InlineCache()
+        self.inline_depth = 0
+        self.inlined_nodes = 0
+        self.visited: Dict[int, Tuple[ast.AST, Any]] = {}  # results of operands simplified ahead of their parents
+        # names bound by imports in the simplified module, and names that calls are not resolved to pure functions
+        # through (see `import_bindings`), as set by `track_bindings`; calls are not evaluated until then
+        self.imported: Set[str] = set()
+        self.shadowed: Optional[Set[str]] = None
         self.global_scope = Scope()
         self.scope = self.global_scope
         if bindings is None:
             bindings = {}
         for name, val in bindings.items():
-            self.scope[name] = val
+            self.scope[name] = val if isinstance(val, ast.AST) else ast.Constant(val)
+
+    def track_bindings(self, tree: ast.Module):
+        self.imported, self.shadowed = import_bindings(tree)
+
+    def register(self, node_type: Type[ast.AST], rule: Rule):
+        if self.profiler is not None:
+            rule = self.profiler.wrap(f"visit_{node_type.__name__}", rule)
+        self.rules[node_type] = rule
+
+    def disable(self, node_type: Union[str, Type[ast.AST]]):
+        if isinstance(node_type, str):
+            if node_type not in RULE_NAMES:
+                raise InvalidRuleError(node_type)
+            node_type = RULE_NAMES[node_type]
+        self.rules.pop(node_type, None)
 
     def visit(self, node: Union[ast.AST, Iterable]) -> Any:
-        if isinstance(node, Iterable):
-            return list(map(self.visit, node))
-        if node is None:
-            return None
-        return super().visit(node)
+        if not isinstance(node, ast.AST):
+            if node is None:
+                return None
+            result = []
+            for item in map(self.visit, node):
+                if isinstance(item, list):
+                    result.extend(item)
+                elif item is not None:
+                    result.append(item)
+            return result
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceededError(f"Simplification took longer than {self.options.time_budget} seconds.")
+        if self.options.iterative:
+            return self.visit_iteratively(node)
+        rule = self.rules.get(type(node))
+        return self.generic_visit(node) if rule is None else rule(node, self)
+
+    def apply_rule(self, node: ast.AST) -> Any:
+        rule = self.rules.get(type(node))
+        return self.generic_visit(node) if rule is None else rule(node, self)
+
+    def visit_iteratively(self, node: ast.AST) -> Any:
+        # The rules visit operands recursively. Here, operands (see `OPERANDS`) are instead visited in post-order from
+        # an explicit stack, so that when a rule visits an operand, its result is simply looked up in `self.visited`.
+        # The interpreter stack therefore only grows with the nesting of statements and of other expressions.
+        visited = self.visited.pop(id(node), None)
+        if visited is not None:
+            return visited[1]
+        ids = []
+        stack = [(node, False)]
+        try:
+            while stack:
+                current, expanded = stack.pop()
+                if not expanded:
+                    stack.append((current, True))
+                    operands = OPERANDS.get(type(current))
+                    if operands is not None:
+                        stack.extend((operand, False) for operand in reversed(operands(current)))
+                elif current is not node:
+                    # results are stored with their nodes, which keeps the ids used as keys from being reused
+                    self.visited[id(current)] = (current, self.apply_rule(current))
+                    ids.append(id(current))
+            return self.apply_rule(node)
+        finally:
+            for key in ids:  # operands that were not visited by their parents' rules
+                self.visited.pop(key, None)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        # Unlike `ast.NodeTransformer.generic_visit`, `node` is never mutated: it is copied only if one of its children
+        # changed, so that the same subtree can be simplified several times (e.g. when unrolling loops).
+        changes = {}
+        for field, old_value in ast.iter_fields(node):
+            if isinstance(old_value, list):
+                new_value = []
+                for value in old_value:
+                    if isinstance(value, ast.AST):
+                        value = self.visit(value)
+                        if value is None:
+                            continue
+                        elif not isinstance(value, ast.AST):
+                            new_value.extend(value)
+                            continue
+                    new_value.append(value)
+                if len(new_value) != len(old_value) or any(new is not old for new, old in zip(new_value, old_value)):
+                    changes[field] = new_value
+            elif isinstance(old_value, ast.AST):
+                new_value = self.visit(old_value)
+                if new_value is not old_value:
+                    changes[field] = new_value
+        return replace(node, **changes) if changes else node
 
     @contextmanager
     def new_scope(self, values: Optional[Dict[str, Any]] = None):
@@ -29,66 +167,8 @@ class Simplifier(ast.NodeTransformer):
         self.scope = Scope(self.global_scope, self.scope)
         for key, val in values.items():
             self.scope[key] = val
-        yield
-        self.scope = self.scope.enclosing
-
-    # CONTROL FLOW #
-
-    def visit_If(self, node: ast.If) -> Union[ast.If, Iterable]:
-        return control_flow.visit_if(node, self)
-
-    def visit_For(self, node: ast.For) -> Union[ast.For, list]:
-        return control_flow.visit_for(node, self)
-
-    # EXPRESSIONS #
-
-    def visit_BoolOp(self, node: ast.BoolOp) -> Union[ast.BoolOp, ast.Constant]:
-        return expressions.visit_bool_op(node, self)
-
-    def visit_BinOp(self, node: ast.BinOp) -> Union[ast.BinOp, ast.Constant]:
-        return expressions.visit_bin_op(node, self)
-
-    def visit_IfExp(self, node: ast.IfExp) -> Union[ast.IfExp, Iterable]:
-        return expressions.visit_if_exp(node, self)
-
-    def visit_Compare(self, node: ast.Compare) -> Union[ast.Compare, ast.Constant]:
-        return expressions.visit_compare(node, self)
-
-    def visit_Call(self, node: ast.Call) -> ast.Call:
-        return expressions.visit_call(node, self)
-
-    def visit_UnaryOp(self, node: ast.UnaryOp) -> Union[ast.Constant, ast.UnaryOp]:
-        return expressions.visit_unary_op(node, self)
-
-    # FUNCTION AND CLASS DEFINITIONS"
-
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
-        return function_and_class_defs.visit_function_def(node, self)
-
-    def visit_Global(self, node: ast.Global) -> None:
-        return function_and_class_defs.visit_global(node, self)
-
-    def visit_Return(self, node: ast.Return) -> ast.Return:
-        return function_and_class_defs.visit_return(node, self)
-
-    # STATEMENTS #
-
-    def visit_Assert(self, node: ast.Assert):
-        return statements.visit_assert(node, self)
-
-    def visit_Delete(self, node: ast.Delete) -> Optional[ast.Delete]:
-        return statements.visit_delete(node, self)
-
-    def visit_Assign(self, node: ast.Assign) -> Optional[ast.Assign]:
-        return statements.visit_assign(node, self)
-
-    def visit_AugAssign(self, node: ast.AugAssign):
-        return statements.visit_aug_assign(node, self)
-
-    # VARIABLES #
-
-    def visit_Attribute(self, node: Attribute) -> Any:
-        return variables.visit_attribute(node, self)
-
-    def visit_Name(self, node: ast.Name) -> Union[ast.Name, ast.Constant]:
-        return variables.visit_name(node, self)
+        try:
+            yield
+        finally:
+            self.scope.close()
+            self.scope = self.scope.enclosing
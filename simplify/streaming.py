@@ -0,0 +1,75 @@
+import json
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+from simplify.cache import MemoryCache, ResultCache
+from simplify.api import transform_source
+from simplify.options import Options
+
+CHUNK_SIZE = 2**16
+
+
+def read_nul_documents(reader: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    # `read1` returns whatever is available instead of waiting for a full chunk, so that each document is yielded as
+    # soon as its terminating NUL byte arrives
+    read = getattr(reader, "read1", reader.read)
+    pending = b""
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        *documents, pending = (pending + chunk).split(b"\0")
+        yield from documents
+    if pending:
+        yield pending  # the last document need not be terminated
+
+
+def read_jsonl_documents(reader: BinaryIO) -> Iterator[bytes]:
+    for line in reader:
+        if line.strip():
+            yield line
+
+
+# Simplifies NUL-separated sources or JSON lines read from `reader` one at a time, writing and flushing each result to
+# `writer` before the next document is read. JSON lines are either strings (the source) or objects with a `source` and
+# optionally `bind` (a list of bindings) and `id` (echoed in the result). Returns the number of documents that failed:
+# in NUL-separated mode, their source is written back unchanged and the error reported to `errors`; in JSON lines mode,
+# an object with an `error` is written instead of one with a `result`.
+def simplify_stream(
+    reader: BinaryIO,
+    writer: BinaryIO,
+    errors: BinaryIO,
+    stream_format: str = "nul",
+    bind_list: Optional[List[str]] = None,
+    cache: Optional[Union[ResultCache, MemoryCache]] = None,
+    options: Optional[Options] = None,
+) -> int:
+    failures = 0
+    if stream_format == "nul":
+        for i, document in enumerate(read_nul_documents(reader)):
+            try:
+                result = transform_source(document.decode(), bind_list, cache, options).encode()
+            except Exception as e:  # including documents that are not valid UTF-8
+                failures += 1
+                errors.write(f"Document {i}: {type(e).__name__}: {e}\n".encode())
+                errors.flush()
+                result = document
+            writer.write(result + b"\0")
+            writer.flush()
+    else:
+        for line in read_jsonl_documents(reader):
+            response = {}
+            try:
+                request = json.loads(line)
+                if isinstance(request, dict):
+                    if "id" in request:
+                        response["id"] = request["id"]
+                    source, bind = request["source"], request.get("bind", bind_list)
+                else:
+                    source, bind = request, bind_list
+                response["result"] = transform_source(source, bind, cache, options)
+            except Exception as e:
+                failures += 1
+                response["error"] = f"{type(e).__name__}: {e}"
+            writer.write(json.dumps(response).encode() + b"\n")
+            writer.flush()
+    return failures
@@ -1,10 +1,10 @@
 import ast
-import importlib
-import inspect
-from typing import Callable, List, Tuple, TypeVar
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple, TypeVar
 
 from simplify.exceptions import InvalidBindingError, InvalidExpressionError, InvalidPythonPathError
-
+from simplify.hashing import eq_nodes  # noqa: F401 (re-exported)
 
 T = TypeVar("T")
 
@@ -36,6 +36,8 @@ class BindingsParser(ast.NodeTransformer):
 
 
 def load_obj_from_path(python_path: str) -> object:
+    import importlib
+
     split_path = python_path.split(":")
     if not 1 <= len(split_path) <= 2:
         raise InvalidPythonPathError(python_path, "Path must have form module_path:callable_obj.")
@@ -59,6 +61,8 @@ def load_obj_from_path(python_path: str) -> object:
 
 
 def get_arg_names(obj: object) -> List[str]:
+    import inspect
+
     sig = inspect.signature(obj)
     return list(sig.parameters.keys())
 
@@ -92,16 +96,136 @@ def unpack(node: ast.AST) -> Tuple[ast.AST, ...]:
     return tuple(getattr(node, attr) for attr in node.__match_args__)
 
 
-def eq_nodes(x, y) -> bool:
-    if type(x) is not type(y):
-        return False
-    if isinstance(x, list):
-        if not len(x) == len(y):
-            return False
-        return all(eq_nodes(a, b) for a, b in zip(x, y))
-    if isinstance(x, ast.AST):
-        for attr in x.__match_args__:
-            if not eq_nodes(getattr(x, attr), getattr(y, attr)):
-                return False
-        return True
-    return x == y
+# Temporarily raises the recursion limit, for the functions of `ast` (e.g. `ast.parse` and `ast.unparse`) that recurse
+# on the depth of the tree. The limit is global to the process: it is left alone if it is already high enough (e.g.
+# raised once by a server handling requests from several threads).
+@contextmanager
+def recursion_limit(limit: int):
+    old_limit = sys.getrecursionlimit()
+    if limit <= old_limit:
+        yield
+        return
+    sys.setrecursionlimit(limit)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+
+def replace(node: ast.AST, **changes) -> ast.AST:
+    fields = {field: getattr(node, field, None) for field in node._fields}
+    fields.update(changes)
+    new_node = type(node)(**fields)
+    for attr in node._attributes:
+        if hasattr(node, attr):
+            setattr(new_node, attr, getattr(node, attr))
+    return new_node
+
+
+def assigned_names(nodes: Iterable[ast.AST]) -> Set[str]:
+    names = set()
+    for node in nodes:
+        for n in ast.walk(node):
+            match n:
+                case ast.Name(id, ast.Store() | ast.Del()):
+                    names.add(id)
+                case ast.Attribute(ast.Name(id), attr, ast.Store() | ast.Del()):
+                    names.add(f"{id}.{attr}")
+                case ast.FunctionDef(name) | ast.AsyncFunctionDef(name) | ast.ClassDef(name):
+                    names.add(name)
+                case ast.alias(name, asname):
+                    names.add(asname or name.split(".")[0])
+    return names
+
+
+# The names bound by imports in `tree`, and the names that may be bound to something else than a builtin or the object
+# they are imported as: the names bound other than by imports (including parameters) and the names imported more than
+# once. The latter are `None` if a star import may bind any name.
+def import_bindings(tree: ast.AST) -> Tuple[Set[str], Optional[Set[str]]]:
+    imported = set()
+    shadowed = set()
+    for node in ast.walk(tree):
+        match node:
+            case ast.ImportFrom(names=[ast.alias("*")]):
+                return imported, None
+            case ast.alias(name, asname):
+                name = asname or name.split(".")[0]
+                if name in imported:
+                    shadowed.add(name)
+                imported.add(name)
+            case ast.Name(id, ast.Store() | ast.Del()):
+                shadowed.add(id)
+            case ast.FunctionDef(name) | ast.AsyncFunctionDef(name) | ast.ClassDef(name):
+                shadowed.add(name)
+            case ast.arg(arg):
+                shadowed.add(arg)
+            case ast.ExceptHandler(name=str(name)) | ast.MatchAs(name=str(name)) | ast.MatchStar(name=str(name)):
+                shadowed.add(name)
+            case ast.MatchMapping(rest=str(name)):
+                shadowed.add(name)
+            case ast.Global(names) | ast.Nonlocal(names):
+                shadowed.update(names)
+    return imported, shadowed
+
+
+def count_nodes(node: Any) -> int:
+    if isinstance(node, list):
+        return sum(map(count_nodes, node))
+    if isinstance(node, ast.AST):
+        return sum(1 for _ in ast.walk(node))
+    return 0
+
+
+def loaded_names(node: ast.AST) -> Set[str]:
+    names = set()
+    for n in ast.walk(node):
+        match n:
+            case ast.Name(id, ast.Load()):
+                names.add(id)
+            case ast.Attribute(ast.Name(id), attr, ast.Load()):
+                names.add(f"{id}.{attr}")
+    return names
+
+
+def parameter_names(args: ast.arguments) -> List[str]:
+    return [a.arg for a in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg] if a]
+
+
+def _locally_bound_names(node: ast.AST) -> Set[str]:
+    match node:
+        case ast.Lambda(args) | ast.FunctionDef(_, args) | ast.AsyncFunctionDef(_, args):
+            return set(parameter_names(args)) | assigned_names(node.body if isinstance(node.body, list) else [])
+        case ast.ListComp(_, generators) | ast.SetComp(_, generators) | ast.GeneratorExp(_, generators):
+            return assigned_names(g.target for g in generators)
+        case ast.DictComp(_, _, generators):
+            return assigned_names(g.target for g in generators)
+    return set()
+
+
+# Replace names loaded in `node` by the values returned by `values` (unless `None`), copying only the subtrees that
+# contain substituted names.
+def substitute(node: ast.AST, values: Callable[[str], Optional[ast.AST]]) -> ast.AST:
+    match node:
+        case ast.Name(id, ast.Load()):
+            return values(id) or node
+        case ast.Attribute(ast.Name(id), attr, ast.Load()):
+            return values(f"{id}.{attr}") or node
+
+    local_names = _locally_bound_names(node)
+    if local_names:
+        outer_values = values
+
+        def values(name):
+            return None if name in local_names else outer_values(name)
+
+    changes = {}
+    for field, old_value in ast.iter_fields(node):
+        if isinstance(old_value, list):
+            new_value = [substitute(v, values) if isinstance(v, ast.AST) else v for v in old_value]
+            if any(new is not old for new, old in zip(new_value, old_value)):
+                changes[field] = new_value
+        elif isinstance(old_value, ast.AST):
+            new_value = substitute(old_value, values)
+            if new_value is not old_value:
+                changes[field] = new_value
+    return replace(node, **changes) if changes else node
@@ -0,0 +1,195 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO
+
+from simplify.batch import find_source_files, get_output_path
+from simplify.incremental import IncrementalSession
+from simplify.api import transform_source
+from simplify.options import Options
+from simplify.utils import parse_bindings
+
+DEBOUNCE = 0.05  # seconds without further changes after which a burst of writes is processed
+POLL_INTERVAL = 0.05  # seconds between scans of the polling backend
+
+# from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+EVENT_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+# whether `path` is a file or directory under `root` that `find_source_files` skips
+def is_ignored(path: Path, root: Path) -> bool:
+    return any(part.startswith(".") or part == "__pycache__" for part in path.relative_to(root).parts)
+
+
+# Reports changes to the `.py` files under a path using inotify, through the C library (Linux only).
+class InotifyBackend:
+    def __init__(self, root: Path):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, Path] = {}
+        self.root = root
+        if root.is_file():
+            self.add_watch(root.parent)
+        else:
+            self.add_watch(root)
+            for dir_path, dir_names, _ in os.walk(root):
+                dir_names[:] = [d for d in dir_names if not d.startswith(".") and d != "__pycache__"]
+                for d in dir_names:
+                    self.add_watch(Path(dir_path, d))
+
+    def add_watch(self, directory: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), EVENT_MASK)
+        if wd >= 0:
+            self.directories[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        data = os.read(self.fd, 2**16)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+            if wd not in self.directories:
+                continue
+            path = self.directories[wd] / os.fsdecode(name)
+            if self.root.is_file():
+                if path == self.root:
+                    changed.add(path)
+            elif is_ignored(path, self.root):
+                continue
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watch(path)
+                    changed.update(find_source_files(str(path)))
+            elif path.suffix == ".py":
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+# Reports changes to the `.py` files under a path by comparing their modification times at regular intervals.
+class PollingBackend:
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.mtimes = self.scan()
+
+    def scan(self) -> Dict[Path, int]:
+        mtimes = {}
+        for path in find_source_files(str(self.root)) if self.root.exists() else []:
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return mtimes
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            mtimes = self.scan()
+            changed = {p for p in mtimes.keys() | self.mtimes.keys() if mtimes.get(p) != self.mtimes.get(p)}
+            self.mtimes = mtimes
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_backend(root: Path):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend(root)
+        except (OSError, AttributeError, TypeError):  # no C library or no inotify support
+            pass
+    return PollingBackend(root)
+
+
+# Re-simplifies the `.py` files under `root` as they change. An incremental session (see `IncrementalSession`) is kept
+# in memory per file, so that an edit only costs parsing the file and re-simplifying it from the first changed
+# top-level statement. Results are written to `output_dir` (mirroring `root`), or else to `out`.
+class Watch:
+    def __init__(
+        self,
+        root: str,
+        output_dir: Optional[str] = None,
+        bind_list: Optional[List[str]] = None,
+        options: Optional[Options] = None,
+        out: TextIO = sys.stdout,
+        log: Callable[[str], None] = lambda message: print(message, file=sys.stderr, flush=True),
+    ):
+        self.root = root
+        self.output_dir = output_dir
+        self.bind_list = bind_list
+        self.bindings = parse_bindings(bind_list or [])
+        self.options = options or Options()
+        self.out = out
+        self.log = log
+        self.sessions: Dict[Path, IncrementalSession] = {}
+        self.sources: Dict[Path, str] = {}
+
+    def update(self, paths: Iterable[Path]):
+        for path in sorted(paths):
+            start = time.perf_counter()
+            try:
+                source = path.read_text()
+            except FileNotFoundError:
+                self.sessions.pop(path, None)
+                self.sources.pop(path, None)
+                continue
+            if self.sources.get(path) == source:
+                continue  # e.g. saved without changes
+            self.sources[path] = source
+            session = self.sessions.setdefault(path, IncrementalSession(self.bindings, self.options))
+            try:
+                result = transform_source(source, self.bind_list, options=self.options, session=session)
+            except Exception as e:
+                self.log(f"{path}: {type(e).__name__}: {e}")
+                continue
+            if self.output_dir:
+                output_path = get_output_path(path, self.root, self.output_dir)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_text(result + "\n")
+            else:
+                print(f"# {path}\n{result}", file=self.out, flush=True)
+            elapsed = (time.perf_counter() - start) * 1e3
+            self.log(f"{path}: simplified in {elapsed:.1f} ms ({session.reused} top-level statements reused)")
+
+    def run(self, backend=None, debounce: float = DEBOUNCE, max_updates: Optional[int] = None):
+        backend = backend or make_backend(Path(self.root))
+        try:
+            self.update(find_source_files(self.root))
+            updates = 0
+            while max_updates is None or updates < max_updates:
+                changed = backend.wait(None)
+                # a burst of writes (e.g. an editor saving several files) is processed once it has settled
+                while True:
+                    more = backend.wait(debounce)
+                    if not more:
+                        break
+                    changed |= more
+                self.update(changed)
+                updates += 1
+        finally:
+            backend.close()
@@ -0,0 +1,28 @@
+import ast
+import subprocess
+import sys
+
+from simplify.api import transform_file, transform_source, transform_tree
+from simplify.options import Options
+
+
+def test_import_does_not_load_cli_dependencies():
+    code = (
+        "import sys, simplify.api; print(*sorted({'typer', 'inspect', 'importlib', 'tracemalloc'} & set(sys.modules)))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
+
+
+def test_transform_tree():
+    tree = transform_tree(ast.parse("x = 2; print(x * y)"), ["y=3"])
+    assert ast.unparse(tree) == "print(6)"
+
+
+def test_transform_file(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("def f(x):\n    return x + x\nprint(f(1 + 1))\n")
+    stats = {}
+    options = Options(max_passes=3)
+    assert transform_file(path, options=options, stats=stats) == transform_source(path.read_text(), options=options)
+    assert stats["converged"]
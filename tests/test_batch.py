@@ -0,0 +1,38 @@
+import pytest
+
+from simplify.batch import find_source_files, simplify_tree
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    root = tmp_path / "src"
+    (root / "pkg").mkdir(parents=True)
+    (root / ".hidden").mkdir()
+    (root / "a.py").write_text("x = 1 + 1\nprint(x)\n")
+    (root / "pkg" / "b.py").write_text("print(2 * 3)\n")
+    (root / "pkg" / "bad.py").write_text("def (\n")
+    (root / "pkg" / "notes.txt").write_text("1 + 1\n")
+    (root / ".hidden" / "c.py").write_text("1 + 1\n")
+    return root
+
+
+def test_find_source_files(source_tree):
+    paths = find_source_files(str(source_tree))
+    assert [p.relative_to(source_tree).as_posix() for p in paths] == ["a.py", "pkg/b.py", "pkg/bad.py"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_simplify_tree_output_dir(source_tree, tmp_path, jobs):
+    output_dir = tmp_path / "out"
+    results = simplify_tree(str(source_tree), output_dir=str(output_dir), jobs=jobs)
+    assert [r.error is None for r in results] == [True, True, False]
+    assert (output_dir / "a.py").read_text() == "print(2)\n"
+    assert (output_dir / "pkg" / "b.py").read_text() == "print(6)\n"
+    assert not (output_dir / "pkg" / "bad.py").exists()
+    assert (source_tree / "a.py").read_text() == "x = 1 + 1\nprint(x)\n"
+
+
+def test_simplify_tree_in_place(source_tree):
+    results = simplify_tree(str(source_tree / "pkg" / "b.py"), jobs=1)
+    assert len(results) == 1 and results[0].error is None
+    assert (source_tree / "pkg" / "b.py").read_text() == "print(6)\n"
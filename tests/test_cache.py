@@ -0,0 +1,35 @@
+import os
+
+from simplify.cache import ResultCache
+from simplify.main import transform_source
+
+
+def test_cache_hit_short_circuits(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert transform_source("x = 42; x * y", ["y=2"], cache) == "84"
+
+    # overwrite the entry to check that the cached text is returned without simplifying again
+    cache.put(cache.key("x = 42; x * y", {"y": 2}), "cached")
+    assert transform_source("x = 42; x * y", ["y=2"], cache) == "cached"
+    assert transform_source("x = 42; x * y", ["y=3"], cache) == "126"
+
+
+def test_cache_key():
+    cache = ResultCache()
+    assert cache.key("x", {}) == cache.key("x", {})
+    assert cache.key("x", {}) != cache.key("y", {})
+    assert cache.key("x", {"y": 1}) != cache.key("x", {"y": 2})
+
+
+def test_cache_evict(tmp_path):
+    cache = ResultCache(tmp_path, max_size=10)
+    keys = [cache.key(str(i), {}) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, "12345")
+        os.utime(cache._path(key), (i, i))
+    cache.get(keys[0])  # marks the oldest entry as recently used
+
+    cache.evict()
+    assert cache.get(keys[0]) == "12345"
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == "12345"
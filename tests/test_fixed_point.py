@@ -0,0 +1,34 @@
+import ast
+from textwrap import dedent
+
+from simplify.fixed_point import simplify_to_fixed_point
+from simplify.main import transform_source
+from simplify.options import Options
+
+
+def test_fixed_point():
+    source = dedent(
+        """
+        f = lambda x: x ** 2
+        y = f(z)
+        print(y)
+        """
+    )
+    stats = {}
+    assert transform_source(source, options=Options(max_passes=5), stats=stats) == "print(z ** 2)"
+    assert stats == {"passes": 3, "converged": True}
+
+
+def test_fixed_point_max_passes():
+    source = "f = lambda x: x ** 2; print(f(z))"
+    result = simplify_to_fixed_point(ast.parse(source), options=Options(max_passes=1))
+    assert ast.unparse(result.tree) == "print((lambda x: x ** 2)(z))"
+    assert result.passes == 1
+    assert not result.converged
+
+
+def test_fixed_point_reuses_settled_statements():
+    tree = ast.parse("print(x)\nprint(1 + 1)")
+    result = simplify_to_fixed_point(tree, options=Options(max_passes=5))
+    assert result.converged
+    assert result.tree.body[0] is tree.body[0]
@@ -0,0 +1,50 @@
+import pytest
+
+from simplify.exceptions import BudgetExceededError
+from simplify.main import transform_source
+from simplify.options import Options
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "10 ** 100000000",
+        "'x' * 1000000000",
+        "1000000000 * 'x'",
+        "1 << 1000000000",
+        "'%100000000s' % 'x'",
+        "'%*s' % (10, 'x')",
+        "1 / 0",
+        "-'a'",
+        "1 < 'a'",
+    ],
+)
+def test_refused_folds(source):
+    assert transform_source(source) == source
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("2 ** 100", str(2**100)),
+        ("10 ** 10 ** 2", "1" + "0" * 100),
+        ("f('ab' * 2)", "f('abab')"),
+        ("f('%5s' % 'x')", "f('    x')"),
+    ],
+)
+def test_allowed_folds(source, result):
+    assert transform_source(source) == result
+
+
+def test_max_int_bits():
+    assert transform_source("2 ** 100", options=Options(max_int_bits=64)) == "2 ** 100"
+
+
+def test_time_budget():
+    with pytest.raises(BudgetExceededError):
+        transform_source("1 + 1", options=Options(time_budget=0))
+
+
+def test_memory_budget():
+    with pytest.raises(BudgetExceededError):
+        transform_source("f('x' * 1000)", options=Options(memory_budget=100))
@@ -0,0 +1,79 @@
+import ast
+import sys
+
+import pytest
+
+from simplify.hashing import Interner, eq_nodes, invalidate, structural_hash, tree_size
+from simplify.simplifier import Simplifier
+from simplify.utils import count_nodes
+
+
+@pytest.mark.parametrize(
+    "x, y, equal",
+    [
+        ("f(x + 1)", "f(x + 1)", True),
+        ("f(x + 1)", "f(x + 2)", False),
+        ("1", "True", False),
+        ("1", "1.0", False),
+        ("(1, 2)", "(1, 2)", True),
+        ("def f(): return 1", "def f(): return 1", True),
+    ],
+)
+def test_structural_hash(x, y, equal):
+    x_tree, y_tree = ast.parse(x), ast.parse(y)
+    assert (structural_hash(x_tree) == structural_hash(y_tree)) == equal
+    assert eq_nodes(x_tree, y_tree) == equal
+
+
+def test_invalidate():
+    tree = ast.parse("x + 1")
+    h = structural_hash(tree)
+    tree.body[0].value.right = ast.Constant(2)
+    invalidate(tree)
+    assert structural_hash(tree) != h
+    assert structural_hash(tree) == structural_hash(ast.parse("x + 2"))
+
+
+def test_interner():
+    interner = Interner()
+    assert interner.constant(1) is interner.constant(1)
+    assert interner.constant(True) is not interner.constant(1)
+
+
+@pytest.mark.parametrize("x, y", [(0.0, -0.0), (0j, complex(-0.0, 0.0)), ((1, 0.0), (1, -0.0))])
+def test_signed_zeros(x, y):
+    assert not eq_nodes(ast.Constant(x), ast.Constant(y))
+    interner = Interner()
+    assert interner.constant(x).value is x
+    assert interner.constant(y).value is y
+    assert interner.constant(x).value is x
+
+
+def test_signed_zeros_are_folded():
+    tree = Simplifier().visit(ast.parse("f(0.0 + 0.0, -(1.0 - 1.0))"))
+    assert ast.unparse(tree) == "f(0.0, -0.0)"
+
+
+def test_folded_constants_are_shared():
+    tree = Simplifier().visit(ast.parse("f(1 + 1, 2 * 1)"))
+    left, right = tree.body[0].value.args
+    assert left is right
+
+
+def test_structural_hash_deep_tree():
+    # built directly, since `ast.parse` itself recurses on the depth of the tree
+    x = y = ast.Name("x", ast.Load())
+    for i in range(3 * sys.getrecursionlimit()):
+        x = ast.BinOp(x, ast.Add(), ast.Constant(i))
+        y = ast.BinOp(y, ast.Add(), ast.Constant(i))
+    assert structural_hash(x) == structural_hash(y)
+    assert eq_nodes(x, y)
+
+
+def test_tree_size():
+    tree = ast.parse("f(x + 1, *ys)")
+    assert tree_size(tree) == count_nodes(tree)
+    # sizes of shared subtrees are cached and counted at each occurrence
+    call = tree.body[0].value
+    outer = ast.Call(call.func, [call, call], [])
+    assert tree_size(outer) == count_nodes(outer) == 3 + 2 * tree_size(call)
@@ -0,0 +1,70 @@
+import ast
+import pickle
+from textwrap import dedent
+
+from simplify.incremental import IncrementalSession
+from simplify.main import transform_source
+from simplify.options import Options
+
+SOURCE = dedent(
+    """
+    x = 1
+    def f(a):
+        return a + x
+    print(f(2))
+    y = 3
+    print(y * x)
+    """
+)
+EDITED = SOURCE.replace("y = 3", "y = 4")
+
+
+def simplify(session, source):
+    return ast.unparse(ast.fix_missing_locations(session.simplify(ast.parse(source)).tree))
+
+
+def test_incremental_session():
+    session = IncrementalSession()
+    assert simplify(session, SOURCE) == transform_source(SOURCE)
+    assert session.reused == 0
+    assert simplify(session, EDITED) == transform_source(EDITED)
+    assert session.reused == 3
+    assert simplify(session, "z = 2\n" + EDITED) == transform_source("z = 2\n" + EDITED)
+    assert session.reused == 0
+
+
+def test_incremental_session_pickle():
+    session = IncrementalSession({"z": 5})
+    simplify(session, SOURCE + "print(z)")
+    session = pickle.loads(pickle.dumps(session))
+    assert simplify(session, EDITED + "print(z)") == transform_source(EDITED + "print(z)", ["z=5"])
+    assert session.reused == 3
+
+
+def test_incremental_session_load(tmp_path):
+    path = tmp_path / "state"
+    session = IncrementalSession(options=Options(max_unroll=1))
+    simplify(session, SOURCE)
+    session.dump(path)
+    assert IncrementalSession.load(path, options=Options(max_unroll=1)).snapshots
+    assert not IncrementalSession.load(path).snapshots
+    assert not IncrementalSession.load(tmp_path / "missing").snapshots
+
+
+def test_incremental_session_inline_growth():
+    # the growth budget spent by the reused prefix is spent for the rest of the module too
+    source = "def f(a):\n    return a + 1\nprint(f(x))\nprint(f(y))"
+    edited = source.replace("f(y)", "f(z)")
+    options = Options(max_inline_growth=5)
+    session = IncrementalSession(options=options)
+    simplify(session, source)
+    assert simplify(session, edited) == transform_source(edited, options=options)
+    assert session.reused == 2
+
+
+def test_incremental_session_fixed_point():
+    source = "f = lambda x: x ** 2\ny = f(z)\nprint(y)"
+    stats = {}
+    session = IncrementalSession(options=Options(max_passes=5))
+    assert transform_source(source, options=Options(max_passes=5), stats=stats, session=session) == "print(z ** 2)"
+    assert stats == {"passes": 3, "converged": True}
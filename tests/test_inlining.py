@@ -0,0 +1,127 @@
+import ast
+from textwrap import dedent
+
+from simplify.main import transform_source
+from simplify.options import Options
+from simplify.simplifier import Simplifier
+
+
+def simplify(source):
+    simp = Simplifier()
+    result = simp.visit(ast.parse(dedent(source)))
+    return ast.unparse(ast.fix_missing_locations(result)), simp.inline_cache
+
+
+def test_inline_cache_hits():
+    source = """
+        def f(x):
+            return x * 2
+        print(f(1), f(1), f(2))
+        """
+    result, cache = simplify(source)
+    assert result.endswith("print(2, 2, 4)")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_inline_cache_free_names():
+    source = """
+        def f(x):
+            return x + c
+        c = 1
+        print(f(1))
+        c = 2
+        print(f(1))
+        """
+    result, cache = simplify(source)
+    assert result.endswith("print(2)\nprint(3)")
+    assert cache.hits == 0
+
+
+def test_inline_cache_signed_zeros():
+    source = """
+        import math
+        def f(x):
+            return math.copysign(1.0, x)
+        print(f(0.0), f(-0.0), f(-0.0))
+        """
+    assert transform_source(dedent(source)).endswith("print(1.0, -1.0, -1.0)")
+    _, cache = simplify(source)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_inline_cache_rebinding():
+    source = """
+        def f(x):
+            return x
+        print(f(1))
+        def f(x):
+            return -x
+        print(f(1))
+        """
+    result, cache = simplify(source)
+    assert result.endswith("print(-1)")
+    assert cache.hits == 0 and len(cache.functions) == 1
+
+
+def test_inline_missing_argument():
+    source = """
+        def f(x):
+            return x
+        f()
+        """
+    assert transform_source(dedent(source)).endswith("f()")
+
+
+def test_inline_bare_return():
+    source = """
+        def f():
+            return
+        print(f())
+        """
+    assert transform_source(dedent(source)).endswith("print(None)")
+
+
+def test_inline_recursion_depth():
+    source = """
+        def f(n):
+            return f(n - 1)
+        print(f(10))
+        """
+    assert transform_source(dedent(source), options=Options(max_inline_depth=3)).endswith("print(f(7))")
+
+
+def test_inline_max_nodes():
+    source = """
+        def f(n):
+            return n * n + 1
+        print(f(x), f(2))
+        """
+    assert transform_source(dedent(source), options=Options(max_inline_nodes=3)).endswith("print(f(x), 5)")
+
+
+def test_inline_max_growth():
+    source = """
+        def f(n):
+            return n + 1
+        print(f(x), f(y))
+        """
+    assert transform_source(dedent(source), options=Options(max_inline_growth=5)).endswith("print(x + 1, f(y))")
+
+
+def test_inline_max_growth_bounds_attempts():
+    # each call inlines three more: without charging the attempts, they would number 3 ** max_inline_depth
+    source = """
+        def f(n):
+            return f(n - 1) + f(n - 2) + f(n - 3)
+        print(f(x))
+        """
+    _, cache = simplify(source)
+    assert cache.misses < 1000
+
+
+def test_inline_lambda_over_budget():
+    # a lambda that is not inlined is simplified in its own scope, where its parameters mask enclosing bindings
+    source = "x = 5\nprint((lambda x: x + 1 * 2)(2))"
+    assert transform_source(source, options=Options(max_inline_depth=0)) == "print((lambda x: x + 2)(2))"
+    source = "x = 5\nprint((lambda x: [x, x, x, x])(g()))"
+    assert transform_source(source, options=Options(max_inline_nodes=3)) == "print((lambda x: [x, x, x, x])(g()))"
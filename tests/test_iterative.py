@@ -0,0 +1,48 @@
+import sys
+from textwrap import dedent
+
+import pytest
+
+from simplify.main import transform_source
+from simplify.options import Options
+
+SOURCES = [
+    "x = 42; print(x * y, -x, [x, {x: (x, *y)}], x < 43 < y)",
+    "print((True or x) and y, f(1 + 2)[3 - 1])",
+    """
+    def f(x):
+        return x * 2
+    print(f(1) + f(f(2)))
+    """,
+    """
+    for i in [1, 2, 3]:
+        print(i + 1 if i % 2 else -i)
+    """,
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_iterative_matches_recursive(source):
+    source = dedent(source)
+    assert transform_source(source, options=Options(iterative=True)) == transform_source(source)
+
+
+def test_iterative_deep_chain():
+    n = 3 * sys.getrecursionlimit()
+    source = "x = 1\nprint(" + " + ".join("x" if i % 2 else f"y{i}" for i in range(n)) + ")"
+    result = transform_source(source, options=Options(iterative=True))
+    assert result.startswith("print(y0 + 1 + y2 + 1") and result.endswith(f"y{n - 2} + 1)")
+
+
+def test_iterative_deep_constant_chain():
+    n = 3 * sys.getrecursionlimit()
+    source = "print(" + " + ".join("1" for _ in range(n)) + ")"
+    assert transform_source(source, options=Options(iterative=True)) == f"print({n})"
+
+
+def test_iterative_deep_conditional_chain():
+    n = 3 * sys.getrecursionlimit()
+    source = "print(" + " else ".join(f"y{i} if x{i} + 1" for i in range(n)) + " else 1 + 1)"
+    result = transform_source(source, options=Options(iterative=True))
+    assert result.startswith("print(y0 if x0 + 1 else y1 if x1 + 1")
+    assert result.endswith(f"y{n - 1} if x{n - 1} + 1 else 2)")
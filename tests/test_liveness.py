@@ -0,0 +1,96 @@
+import ast
+from textwrap import dedent
+
+import pytest
+
+from simplify.liveness import eliminate_dead_code
+from simplify.main import transform_source
+from simplify.options import Options
+
+
+def eliminate(source):
+    return ast.unparse(eliminate_dead_code(ast.parse(dedent(source))))
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        # dead stores
+        ("def f():\n    x = 1\n    x = 2\n    return x", "def f():\n    x = 2\n    return x"),
+        ("def f():\n    x = g()\n    return 1", "def f():\n    g()\n    return 1"),
+        ("def f(x):\n    y = x\n    return 1", "def f(x):\n    return 1"),
+        # stores read later, possibly by other iterations or by closures
+        ("def f():\n    x = 1\n    del x", "def f():\n    x = 1\n    del x"),
+        ("def f():\n    x = 1\n    x += 1\n    return x", "def f():\n    x = 1\n    x += 1\n    return x"),
+        ("def f():\n    x = 0\n    while g():\n        h(x)\n        x = 1", None),
+        ("def f():\n    x = 0\n    for i in y:\n        if i:\n            break\n        x = 1\n    return x", None),
+        ("def f():\n    g = lambda: x\n    x = 1\n    return g", None),
+        ("def f():\n    global x\n    x = 1", None),
+        ("def f():\n    x = 1\n    return locals()", None),
+        (
+            "def f():\n    try:\n        x = 1\n        g()\n        x = 2\n    except E:\n        return x",
+            None,
+        ),
+        ("def f():\n    x = 1\n    try:\n        return 2\n    finally:\n        g(x)", None),
+        # stores outside of functions are observable
+        ("x = 1", None),
+        # local functions
+        ("def f():\n    def g():\n        return 1\n    return 2", "def f():\n    return 2"),
+        ("def f():\n    @d\n    def g():\n        return 1\n    return 2", None),
+        ("def f():\n    def g():\n        return 1\n    return g()", None),
+        # nested functions are analysed separately
+        (
+            "class C:\n    x = 1\n\n    def f(self):\n        x = 2",
+            "class C:\n    x = 1\n\n    def f(self):\n        pass",
+        ),
+    ],
+)
+def test_eliminate_dead_code(source, result):
+    assert eliminate(source) == ast.unparse(ast.parse(result or source))
+
+
+def test_eliminate_dead_code_option():
+    source = dedent(
+        """
+        x = 42
+        def f(a):
+            b = a * x
+            c = 3
+            for i in [1, 2]:
+                c += i
+            return b + c
+        def g(a):
+            c = 3
+            return a + c
+        print(f(y), g(y))
+        """
+    )
+    result = transform_source(source, options=Options(eliminate_dead_code=True))
+    expected = "x = 42\n\ndef f(a):\n    b = a * 42\n    return b + 6\n\ndef g(a):\n    return a + 3\n"
+    expected += "print(f(y), y + 3)"
+    assert result == expected
+
+
+def test_eliminate_dead_code_local_shadows_global():
+    source = dedent(
+        """
+        x = 1
+        def f(y):
+            x = y
+            return x
+        def g():
+            x = h()
+            return x
+        print(f(5), g())
+        """
+    )
+    result = transform_source(source, options=Options(eliminate_dead_code=True))
+    expected = "x = 1\n\ndef f(y):\n    x = y\n    return x\n\ndef g():\n    x = h()\n    return x\n"
+    expected += "print(5, g())"
+    assert result == expected
+
+
+def test_eliminate_dead_code_masked_aug_assign():
+    # `+=` may update a list in place, so a masked name is not rewritten to `acc = acc + [1]`
+    source = "acc = 1\n\ndef f():\n    acc = g()\n    acc += [1]\n    return acc"
+    assert transform_source(source, options=Options(eliminate_dead_code=True)) == source
@@ -0,0 +1,115 @@
+import ast
+
+import pytest
+
+from simplify.api import transform_file, transform_source
+from simplify.batch import simplify_tree
+from simplify.cache import MemoryCache
+from simplify.exceptions import InvalidPythonPathError
+from simplify.modules import ModuleResolver, find_source
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("from .consts import SIZE\n")
+    (root / "pkg" / "consts.py").write_text(
+        "from pkg.base import BASE\n"
+        "SIZE = BASE * 2\n"
+        "def double(x):\n"
+        "    return x * 2\n"
+        "def size_of(x):\n"
+        "    return len(x) + SIZE\n"
+        "def scaled(x):\n"
+        "    return x * factor\n"
+        "factor = 3\n"
+        "COUNTER = 0\n"
+        "def bump():\n"
+        "    global COUNTER\n"
+        "    COUNTER += 1\n"
+        "open('side-effect', 'w')\n"
+    )
+    (root / "pkg" / "base.py").write_text("BASE = 2\n")
+    (root / "pkg" / "main.py").write_text(
+        "from .consts import SIZE, double as twice, size_of, scaled, COUNTER\n"
+        "from pkg import SIZE as S\n"
+        "print(twice(SIZE), size_of(y), scaled(1), COUNTER, S)\n"
+    )
+    return root
+
+
+def test_summary(project):
+    summary = ModuleResolver([project]).summary(project / "pkg" / "consts.py")
+    assert summary.names["SIZE"].value == 4
+    assert summary.free_names == {"double": (), "size_of": ("len",)}
+    # functions reading module globals and globals written by functions are not exported
+    assert "scaled" not in summary.names and "COUNTER" not in summary.names
+    assert set(summary.dependencies) == {str(project / "pkg" / "consts.py"), str(project / "pkg" / "base.py")}
+    assert not (project / "side-effect").exists()
+
+
+def test_transform_file(project):
+    result = transform_file(project / "pkg" / "main.py", resolver=ModuleResolver([project]))
+    assert result.splitlines()[-1] == "print(8, len(y) + 4, scaled(1), COUNTER, 4)"
+    # without a resolver, imported names are unknown
+    assert transform_source("x = 1\nfrom m import x\nprint(x)") == "from m import x\nprint(x)"
+
+
+def test_shadowed_builtins(project):
+    source = "len = 3\nfrom pkg.consts import size_of\nprint(size_of(y))"
+    assert transform_source(source, resolver=ModuleResolver([project])).splitlines()[-1] == "print(size_of(y))"
+
+
+def test_summaries_cached_on_disk(project, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = project / "pkg" / "consts.py"
+    ModuleResolver([project], cache_dir).summary(path)
+
+    def summarize(self, path, digest):
+        raise AssertionError(f"{path} summarized again")
+
+    with monkeypatch.context() as m:
+        m.setattr(ModuleResolver, "_summarize", summarize)
+        assert ModuleResolver([project], cache_dir).summary(path).names["SIZE"].value == 4
+
+    # summaries are recomputed when the module or one of its dependencies changes
+    (project / "pkg" / "base.py").write_text("BASE = 5\n")
+    assert ModuleResolver([project], cache_dir).summary(path).names["SIZE"].value == 10
+
+
+def test_result_cache(project):
+    cache = MemoryCache()
+    path = project / "pkg" / "main.py"
+    assert "print(8," in transform_file(path, cache=cache, resolver=ModuleResolver([project]))
+    (project / "pkg" / "base.py").write_text("BASE = 5\n")
+    assert "print(20," in transform_file(path, cache=cache, resolver=ModuleResolver([project]))
+
+
+def test_import_cycle(tmp_path):
+    (tmp_path / "a.py").write_text("from b import B\nA = 1\n")
+    (tmp_path / "b.py").write_text("from a import A\nB = 2\n")
+    resolver = ModuleResolver([tmp_path])
+    # `b` is summarized while `a` is, so that `A` is not known in `b`
+    result = transform_source("from a import A, B\nfrom b import A as C\nprint(A, B, C)", resolver=resolver)
+    assert result.splitlines()[-1] == "print(1, 2, C)"
+
+
+def test_batch(project, tmp_path):
+    output_dir = tmp_path / "out"
+    results = simplify_tree(str(project), output_dir=str(output_dir), jobs=2, resolver=ModuleResolver([project]))
+    assert all(r.error is None for r in results)
+    assert (output_dir / "pkg" / "main.py").read_text().splitlines()[
+        -1
+    ] == "print(8, len(y) + 4, scaled(1), COUNTER, 4)"
+
+
+def test_find_source(project):
+    source, path = find_source("pkg.consts:size_of", [project])
+    assert path == project / "pkg" / "consts.py"
+    assert ast.unparse(ast.parse(source)) == "def size_of(x):\n    return len(x) + SIZE"
+    assert find_source("pkg.base", [project])[0] == "BASE = 2\n"
+    with pytest.raises(InvalidPythonPathError):
+        find_source("pkg.missing", [project])
+    with pytest.raises(InvalidPythonPathError):
+        find_source("pkg.consts:missing", [project])
@@ -0,0 +1,26 @@
+import ast
+import json
+
+from simplify.main import transform_source
+from simplify.profiling import Profiler
+from simplify.rules import DEFAULT_RULES
+from simplify.simplifier import Simplifier
+
+
+def test_profiler():
+    with Profiler() as profiler:
+        assert transform_source("x = 42; x * (1 + 2)", profiler=profiler) == "126"
+    rules = profiler.report()["rules"]
+    assert rules["visit_BinOp"]["calls"] == 2
+    assert rules["visit_BinOp"]["nodes_in"] == 12
+    assert rules["visit_BinOp"]["nodes_out"] == 2
+    assert rules["visit_Assign"]["nodes_out"] == 0
+    assert all(s["self_time"] <= s["total_time"] for s in rules.values())
+    assert json.loads(profiler.to_json())["rules"].keys() == rules.keys()
+    assert "visit_BinOp" in profiler.summary()
+
+
+def test_profiler_disabled():
+    simp = Simplifier()
+    assert simp.rules[ast.BinOp] is DEFAULT_RULES[ast.BinOp]
+    Simplifier(profiler=Profiler(trace_memory=False)).visit(ast.parse("1 + 1"))
@@ -1,8 +1,11 @@
+import ast
 from textwrap import dedent
 
 import pytest
 
 from simplify.main import transform_source
+from simplify.options import Options
+from simplify.simplifier import Simplifier
 
 
 def test_if():
@@ -18,20 +21,230 @@ def test_if():
     assert result == transform_source(source)
 
 
-@pytest.mark.parametrize("template", ["return x", "print(x)"])
-def test_for(template):
+def test_for():
     source = dedent(
-        f"""
+        """
         xs = [1, 2, 3]
         for x in xs:
-            {template}
+            print(x)
+        """
+    )
+    result = dedent(
+        """
+        print(1)
+        print(2)
+        print(3)
+        """
+    ).strip("\n")
+    assert transform_source(source) == result
+
+
+def test_for_return():
+    # neither the iterations after a `return` nor the `else` clause are executed
+    source = "def f():\n    for x in [1, 2, 3]:\n        print(x)\n        return x\n    else:\n        print(0)"
+    assert transform_source(source) == "def f():\n    print(1)\n    return 1"
+
+
+def test_for_else():
+    source = dedent(
+        """
+        for x in [1, 2]:
+            print(x)
+        else:
+            print(x + 1)
+        """
+    )
+    result = "print(1)\nprint(2)\nprint(3)"
+    assert transform_source(source) == result
+
+
+def test_for_aug_assign():
+    source = dedent(
+        """
+        acc = 0
+        for x in [1, 2, 3]:
+            acc += x
+        acc
+        """
+    )
+    assert transform_source(source) == "6"
+
+
+def test_for_max_unroll():
+    source = dedent(
+        """
+        n = 1
+        for x in [1, 2, 3]:
+            print(x + n)
         """
     )
     result = dedent(
-        f"""
-        {template.replace("x", "1")}
-        {template.replace("x", "2")}
-        {template.replace("x", "3")}
+        """
+        for x in [1, 2, 3]:
+            print(x + 1)
+        """
+    ).strip("\n")
+    assert transform_source(source, options=Options(max_unroll=2)) == result
+
+
+def test_for_loop_carried():
+    source = dedent(
+        """
+        i = 0
+        for x in y:
+            i = i + 1
+        print(i)
+        """
+    )
+    assert transform_source(source) == source.strip("\n")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "def f(x):\n    return x\nfor i in y:\n    g(f)",
+        "import math\nfor i in y:\n    print(math)",
+        "from math import pi\nwhile f():\n    print(pi)",
+    ],
+)
+def test_kept_loop_definitions(source):
+    assert transform_source(source) == source
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("n = 2\nfor i in y:\n    print(n * 3)", "for i in y:\n    print(6)"),
+        ("for i in y:\n    j = 2\n    print(i * j)\nprint(j)", "for i in y:\n    j = 2\n    print(i * 2)\nprint(j)"),
+        (
+            "x = 1\nfor i in y:\n    print(x)\n    x = 2\nprint(x)",
+            "x = 1\nfor i in y:\n    print(x)\n    x = 2\nprint(x)",
+        ),
+        # names assigned in the loop mask the bindings of enclosing scopes
+        (
+            "x = 1\ndef f():\n    for i in y:\n        x = i\n    return x",
+            "def f():\n    for i in y:\n        x = i\n    return x",
+        ),
+    ],
+)
+def test_kept_loop_bodies(source, result):
+    assert transform_source(source) == result
+
+
+def test_for_does_not_mutate():
+    source = dedent(
+        """
+        for x in [1, 2]:
+            print(x + 1)
+        """
+    )
+    tree = ast.parse(source)
+    dump = ast.dump(tree)
+    assert ast.unparse(Simplifier().visit(tree)) == "print(2)\nprint(3)"
+    assert ast.dump(tree) == dump
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("for i in range(3):\n    print(i)", "print(0)\nprint(1)\nprint(2)"),
+        ("for c in 'ab':\n    print(c)", "print('a')\nprint('b')"),
+        ("for k, (v, w) in (('a', (1, 2)), ('b', (3, 4))):\n    print(k, v + w)", "print('a', 3)\nprint('b', 7)"),
+        ("for i, c in enumerate(reversed('ab'), 1):\n    print(i, c)", "print(1, 'b')\nprint(2, 'a')"),
+        ("for x, y in zip((1, 2), 'ab'):\n    print(x, y)", "print(1, 'a')\nprint(2, 'b')"),
+        # iterables that are not materialized
+        ("for x in {1, 2}:\n    print(x)", "for x in {1, 2}:\n    print(x)"),
+        ("for x, y in ((1, 2), 3):\n    print(x)", "for x, y in ((1, 2), 3):\n    print(x)"),
+        ("for i in range(10 ** 20):\n    print(i)", "for i in range(100000000000000000000):\n    print(i)"),
+    ],
+)
+def test_for_iterables(source, result):
+    assert transform_source(source) == result
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("for x in range(2):\n    print(x)", "x = 0\nprint(0)\nx = 1\nprint(1)"),
+        # `range` is rebound, which is only kept when dead code is eliminated
+        ("range = f\nfor x in range(2):\n    print(x)", "range = f\nfor x in range(2):\n    print(x)"),
+    ],
+)
+def test_for_iterables_eliminate_dead_code(source, result):
+    assert transform_source(source, options=Options(eliminate_dead_code=True)) == result
+
+
+def test_for_undecided_branch():
+    source = dedent(
+        """
+        def f(crc):
+            for j in range(8):
+                if crc & 1:
+                    crc = crc >> 1 ^ 3988292384
+                else:
+                    crc >>= 1
+            return crc
         """
     ).strip("\n")
+    assert transform_source(source) == source
+
+
+@pytest.mark.parametrize("eliminate_dead_code", [False, True])
+def test_for_unknown_targets(eliminate_dead_code):
+    source = "for i in range(2):\n    a[i] = i\n    a[i] += i\n    assert a[i] < n\n    del a[i]"
+    result = transform_source(source, options=Options(eliminate_dead_code=eliminate_dead_code))
+    assert "a[1] = 1\na[1] += 1\nassert a[1] < n\ndel a[1]" in result
+
+
+def test_for_range_max_unroll():
+    source = "for i in range(5):\n    print(i)"
+    assert transform_source(source, options=Options(max_unroll=4)) == source
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("i = 0\nacc = 0\nwhile i < 10:\n    acc += i\n    i += 1\nprint(acc, i)", "print(45, 10)"),
+        (
+            "i = 0\nwhile i < 2:\n    print(i)\n    i += 1\nelse:\n    print('done')",
+            "print(0)\nprint(1)\nprint('done')",
+        ),
+        (
+            "i = 0\nwhile True:\n    i += 1\n    if i % 2:\n        continue\n    if i > 4:\n        break\n"
+            "    print(i)\nelse:\n    print('never')\nprint(i)",
+            "print(2)\nprint(4)\nprint(6)",
+        ),
+        (
+            "def f():\n    i = 0\n    while i < 3:\n        if i == 1:\n            return i\n        i += 1",
+            "def f():\n    return 1",
+        ),
+        (
+            "def f(acc):\n    i = 0\n    while i < 3:\n        acc += i\n        i += 1\n    return acc",
+            "def f(acc):\n    acc += 0\n    acc += 1\n    acc += 2\n    return acc",
+        ),
+        # loops whose termination cannot be decided
+        ("i = 0\nwhile f(i):\n    i += 1\nprint(i)", "i = 0\nwhile f(i):\n    i += 1\nprint(i)"),
+        ("while True:\n    print(1)", "while True:\n    print(1)"),
+        (
+            "n = 10\nwhile n > 1:\n    if g(n):\n        n //= 2\n    n -= 1\nprint(n)",
+            "n = 10\nwhile n > 1:\n    if g(n):\n        n //= 2\n    n -= 1\nprint(n)",
+        ),
+        ("while c():\n    print(1 + 2)", "while c():\n    print(3)"),
+        (
+            "def f():\n    x = 1\n    while c():\n        x = h()\n    return x",
+            "def f():\n    x = 1\n    while c():\n        x = h()\n    return x",
+        ),
+        (
+            "x = 1\ndef f():\n    while c():\n        x = h()\n    return x",
+            "def f():\n    while c():\n        x = h()\n    return x",
+        ),
+    ],
+)
+def test_while(source, result):
     assert transform_source(source) == result
+
+
+def test_while_max_unroll():
+    source = "i = 0\nwhile i < 5:\n    i += 1\nprint(i)"
+    assert transform_source(source, options=Options(max_unroll=4)) == source
+    assert transform_source(source, options=Options(max_unroll=5)) == "print(5)"
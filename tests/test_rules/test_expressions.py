@@ -1,8 +1,12 @@
+import ast
+import sys
 from textwrap import dedent
 
 import pytest
 
 from simplify.main import transform_source
+from simplify.options import Options
+from simplify.simplifier import Simplifier
 
 
 @pytest.mark.parametrize(
@@ -17,6 +21,37 @@ def test_arithmetic(expr, answer):
     assert answer == transform_source(expr)
 
 
+@pytest.mark.parametrize(
+    "expr, answer, reassociated",
+    [
+        ("1 + 2 + 3", "6", "6"),
+        ("1 + 2 + x + 3", "3 + x + 3", "x + 6"),
+        ("x * 2 * y * 3", "x * 2 * y * 3", "x * y * 6"),
+        ("'a' + 'b' + x + 'c'", "'ab' + x + 'c'", "'ab' + x + 'c'"),
+        ("1.5 + x + 2.5", "1.5 + x + 2.5", "1.5 + x + 2.5"),
+        ("1 | 2 | x & 4 & 5", "3 | x & 4 & 5", "x & 4 | 3"),
+        ("a - 1 - 2", "a - 1 - 2", "a - 1 - 2"),
+    ],
+)
+def test_chain(expr, answer, reassociated):
+    assert transform_source(expr) == answer
+    assert transform_source(expr, options=Options(reassociate=True)) == reassociated
+
+
+def test_long_chain():
+    # chains are folded without recursing along them (and, when reassociated, rebuilt with logarithmic depth)
+    n = 2 * sys.getrecursionlimit()
+    node = ast.Name("x", ast.Load())
+    for i in range(n):
+        node = ast.BinOp(node, ast.Add(), ast.Constant(i) if i % 2 else ast.Name(f"x{i}", ast.Load()))
+    result = Simplifier(options=Options(reassociate=True)).visit(node)
+    depth, last = 0, result
+    while isinstance(last, ast.BinOp):
+        last, depth = last.right, depth + 1
+    assert last.value == sum(range(1, n, 2))
+    assert depth < 20
+
+
 @pytest.mark.parametrize(
     "source, result",
     [
@@ -86,6 +121,63 @@ def test_call_fn_def():
     assert result == transform_source(source)
 
 
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("[x * x for x in range(4)]", "[0, 1, 4, 9]"),
+        ("[x for x in range(10) if x % 3 == 0 if x]", "[3, 6, 9]"),
+        ("{c for c in 'aba'}", "{'a', 'b'}"),
+        ("{x: x % 2 for x in range(3)}", "{0: 0, 1: 1, 2: 0}"),
+        ("[(i, c) for i in range(2) for c in 'ab' if i == 0 or c == 'b']", "[(0, 'a'), (0, 'b'), (1, 'b')]"),
+        ("sum((x for x in range(101))), tuple((i * 2 for i in range(3)))", "(5050, (0, 2, 4))"),
+        # comprehensions that are not folded
+        ("[f(x) for x in range(3)]", "[f(x) for x in range(3)]"),
+        ("{x for x in ()}", "{x for x in ()}"),
+        ("(x for x in range(3))", "(x for x in range(3))"),
+        ("[y := x for x in range(3)]", "[(y := x) for x in range(3)]"),
+        ("print([i for i in range(10 ** 20)])", "print([i for i in range(100000000000000000000)])"),
+        ("sum((i for i in range(2 ** 70)))", "sum((i for i in range(1180591620717411303424)))"),
+        # the targets of comprehensions shadow enclosing bindings, except in the first iterable
+        ("x = 3\nprint([x for x in y], [x for x in range(x)])", "print([x for x in y], [0, 1, 2])"),
+    ],
+)
+def test_comprehension(source, result):
+    assert transform_source(source) == result
+
+
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("print(len((1, 2, 3)), max(2, 5), abs(-4), sum([1, 2]), str(3))", "print(3, 5, 4, 3, '3')"),
+        ("int('ff', base=16) + round(2.567, 2)", "257.57"),
+        ("import math\nmath.sqrt(16)", "import math\n4.0"),
+        (
+            "import math as m\nfrom operator import add as plus\nplus(m.floor(2.5), 1)",
+            "import math as m\nfrom operator import add as plus\n3",
+        ),
+        # results that are not constants, or that exceed the limits of constant folding
+        ("range(3), sorted((2, 1)), len(x)", "(range(3), sorted((2, 1)), len(x))"),
+        ("pow(2, 1000000), 'x' * 3", "(pow(2, 1000000), 'xxx')"),
+        ("import math\nmath.factorial(1000000)", "import math\nmath.factorial(1000000)"),
+        (
+            "import math\nmath.perm(3000000), math.perm(3000000, None)",
+            "import math\n(math.perm(3000000), math.perm(3000000, None))",
+        ),
+        ("import math\nmath.perm(5), math.perm(5, None)", "import math\n(120, 120)"),
+        ("int('x')", "int('x')"),
+        # shadowed builtins and imports
+        ("def f(len):\n    return len((1,))", "def f(len):\n    return len((1,))"),
+        ("x = len((1,))\nlen = g", "x = len((1,))\nlen = g"),
+        ("from m import len\nlen(())", "from m import len\nlen(())"),
+        ("from m import *\nlen(())", "from m import *\nlen(())"),
+        ("import numpy as math\nmath.sqrt(4)", "import numpy as math\nmath.sqrt(4)"),
+        ("import math\nimport cmath as math\nmath.sqrt(4)", "import math\nimport cmath as math\nmath.sqrt(4)"),
+    ],
+)
+def test_call_pure_function(source, result):
+    assert transform_source(source, options=Options(eliminate_dead_code=True)) == result
+
+
 @pytest.mark.parametrize(
     "source",
     [
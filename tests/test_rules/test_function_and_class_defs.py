@@ -37,6 +37,17 @@ def test_lambda():
     assert result == transform_source(source)
 
 
+@pytest.mark.parametrize(
+    "source, result",
+    [
+        ("x = 1\ndef f(x, y=x):\n    return x + y", "def f(x, y=1):\n    return x + y"),
+        ("x = 1\nprint(lambda x, y=x: x + y)", "print(lambda x, y=1: x + y)"),
+    ],
+)
+def test_parameters_mask_enclosing_bindings(source, result):
+    assert transform_source(source) == result
+
+
 @pytest.mark.parametrize(
     "source, result",
     [
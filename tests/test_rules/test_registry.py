@@ -0,0 +1,28 @@
+import ast
+
+import pytest
+
+from simplify.exceptions import InvalidRuleError
+from simplify.main import transform_source
+from simplify.options import Options
+from simplify.simplifier import Simplifier
+
+
+def test_disabled_rules():
+    source = "x = 2; print(x + 1)"
+    assert transform_source(source, options=Options(disabled_rules=("BinOp",))) == "print(2 + 1)"
+    assert transform_source(source, options=Options(disabled_rules=("Assign",))) == "x = 2\nprint(x + 1)"
+
+
+def test_disable_unknown_rule():
+    with pytest.raises(InvalidRuleError):
+        Simplifier(options=Options(disabled_rules=("Foo",)))
+
+
+def test_register():
+    def visit_constant(node, simp):
+        return ast.Constant(-node.value) if isinstance(node.value, int) else node
+
+    simp = Simplifier()
+    simp.register(ast.Constant, visit_constant)
+    assert ast.unparse(simp.visit(ast.parse("print(1 + 2)"))) == "print(-3)"
@@ -3,7 +3,7 @@ from textwrap import dedent
 
 
 from simplify.simplifier import Simplifier
-from simplify.scope import Scope
+from simplify.scope import ConstantCell, Scope
 
 
 def test_scope():
@@ -30,3 +30,82 @@ def test_scope():
         decorator_list=[],
     )
     assert result_scope == simplifier.scope
+
+
+def test_scope_chain_lookup():
+    global_scope = Scope()
+    global_scope["x"] = ast.Constant(1)
+    inner = Scope(global_scope, global_scope)
+    inner.add_global("y")
+    inner["x"] = ast.Constant(2)
+    inner["y"] = ast.Constant(3)
+    innermost = Scope(global_scope, inner)
+
+    assert innermost["x"].value == 2
+    assert global_scope["x"].value == 1
+    assert global_scope["y"].value == 3
+    assert innermost.get("z") is None
+    assert "z" not in innermost
+
+    # bindings added to an outer scope are found from inner scopes unless shadowed
+    global_scope["x"] = ast.Constant(4)
+    global_scope["z"] = ast.Constant(5)
+    assert innermost["x"].value == 2
+    assert innermost["z"].value == 5
+
+    innermost.close()
+    inner.close()
+    assert global_scope["x"].value == 4
+    del global_scope["x"]
+    assert "x" not in global_scope
+
+
+def test_new_scope():
+    simplifier = Simplifier()
+    simplifier.scope["x"] = ast.Constant(1)
+    with simplifier.new_scope({"x": ast.Constant(2)}):
+        assert simplifier.scope["x"].value == 2
+    assert simplifier.scope["x"].value == 1
+
+
+def test_snapshot_restore():
+    scope = Scope()
+    scope["x"] = ast.Constant(1)
+    snapshot = scope.snapshot()
+    scope["x"] = ast.Constant(2)
+    scope["y"] = ast.Constant(3)
+    scope.restore(snapshot)
+    assert scope["x"].value == 1
+    assert "y" not in scope
+
+
+def test_compact_constants():
+    scope = Scope()
+    scope["x"] = ast.Constant(1, lineno=1, col_offset=4)
+    scope["s"] = ast.Constant("a", kind="u")
+    assert type(scope.values["x"]) is ConstantCell
+    assert type(scope.values["s"]) is ast.Constant
+
+    # the node is built on first use and then shared by every substitution
+    node = scope["x"]
+    assert isinstance(node, ast.Constant) and node.value == 1
+    assert scope["x"] is node
+    assert scope["s"].kind == "u"
+
+
+def test_flatten_view():
+    global_scope = Scope()
+    global_scope["x"] = ast.Constant(1)
+    global_scope["y"] = ast.Constant(2)
+    inner = Scope(global_scope, global_scope)
+    inner["x"] = ast.Constant(3)
+
+    view = inner.flatten()
+    assert {k: v.value for k, v in view.items()} == {"x": 3, "y": 2}
+    assert {k: v.value for k, v in global_scope.flatten().items()} == {"x": 1, "y": 2}
+
+    # the view is not a copy: later bindings are visible through it
+    inner["z"] = ast.Constant(4)
+    assert view["z"].value == 4
+    inner.close()
+    assert "z" not in global_scope.flatten()
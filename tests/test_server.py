@@ -0,0 +1,89 @@
+import io
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from simplify.api import DEEP_RECURSION_LIMIT
+from simplify.client import Client, ServerError
+from simplify.options import Options
+from simplify.server import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, SIMPLIFICATION_ERROR, Daemon, serve
+
+
+def request(method, request_id=1, **params):
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+
+@pytest.mark.parametrize(
+    "line, code",
+    [
+        ("garbage", PARSE_ERROR),
+        (request("nope"), METHOD_NOT_FOUND),
+        (request("transform_source", src="1"), INVALID_PARAMS),
+        (request("transform_source", source="1", options={"nope": 1}), INVALID_PARAMS),
+        (request("transform_source", source="def ("), SIMPLIFICATION_ERROR),
+    ],
+)
+def test_daemon_errors(line, code):
+    assert Daemon().handle(line)["error"]["code"] == code
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        {"jsonrpc": "2.0", "method": "nope"},
+        {"jsonrpc": "2.0", "method": "transform_source", "params": {"source": "def ("}},
+        {"method": "ping"},
+    ],
+)
+def test_daemon_failed_notifications(request_):
+    assert Daemon().handle(json.dumps(request_)) is None
+
+
+def test_daemon_serve_stream():
+    lines = [
+        request("transform_source", 1, source="x = 2; x * y", bind=["y=3"]),
+        request("transform_source", 2, source="x = 2; x * y", bind=["y=3"]),
+        request("shutdown", 3),
+        request("ping", 4),
+    ]
+    daemon = Daemon()
+    writer = io.StringIO()
+    daemon.serve_stream(io.StringIO("\n".join(lines)), writer)
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2, 3]
+    assert responses[0]["result"] == responses[1]["result"] == "6"
+    assert len(daemon.cache.entries) == 1
+
+
+def test_client_spawn():
+    with Client.spawn() as client:
+        assert client.call("ping") == "pong"
+        assert client.transform_source("x = 42; x * y", ["y=2"]) == "84"
+        assert client.transform_source("1 + 1", options=Options(max_int_bits=1)) == "2"
+        with pytest.raises(ServerError):
+            client.transform_source("def (")
+
+
+def test_client_socket(tmp_path):
+    socket_path = str(tmp_path / "simplify.sock")
+    limit = sys.getrecursionlimit()
+    thread = threading.Thread(target=serve, args=(socket_path,))
+    thread.start()
+    for _ in range(100):
+        try:
+            client = Client.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.01)
+    with Client.connect(socket_path) as other_client:
+        assert other_client.transform_source("2 * 3") == "6"
+    assert client.transform_source("2 * 3") == "6"
+    # the recursion limit is raised for the lifetime of the server, not by each request
+    assert sys.getrecursionlimit() == DEEP_RECURSION_LIMIT
+    client.shutdown()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert sys.getrecursionlimit() == limit
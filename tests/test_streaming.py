@@ -0,0 +1,64 @@
+import io
+import json
+
+from simplify.streaming import read_nul_documents, simplify_stream
+
+
+class ChunkedReader(io.RawIOBase):
+    # returns one chunk per read, recording how many chunks were consumed when each result was written
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        if not self.chunks:
+            return b""
+        self.reads += 1
+        return self.chunks.pop(0)
+
+
+def test_read_nul_documents():
+    reader = ChunkedReader([b"a\0b", b"c\0", b"\0d"])
+    assert list(read_nul_documents(reader)) == [b"a", b"bc", b"", b"d"]
+
+
+def test_simplify_stream_nul():
+    reader = ChunkedReader([b"x = 1\nprint(x + 1)\0print(", b"2 * 3)\0def (\0"])
+    writer = io.BytesIO()
+    errors = io.BytesIO()
+    assert simplify_stream(reader, writer, errors, "nul") == 1
+    assert writer.getvalue().split(b"\0") == [b"print(2)", b"print(6)", b"def (", b""]
+    assert errors.getvalue().startswith(b"Document 2: SyntaxError")
+
+
+def test_simplify_stream_nul_invalid_utf8():
+    reader = ChunkedReader([b"1 + 1\0print('\xff')\0", b"2 + 2\0"])
+    writer = io.BytesIO()
+    errors = io.BytesIO()
+    assert simplify_stream(reader, writer, errors, "nul") == 1
+    assert writer.getvalue().split(b"\0") == [b"2", b"print('\xff')", b"4", b""]
+    assert errors.getvalue().startswith(b"Document 1: UnicodeDecodeError")
+
+
+def test_simplify_stream_flushes_each_result():
+    reader = ChunkedReader([b"1 + 1\0", b"2 + 2\0"])
+    written = []
+
+    class Writer(io.BytesIO):
+        def flush(self):
+            written.append((reader.reads, self.getvalue()))
+
+    simplify_stream(reader, Writer(), io.BytesIO(), "nul")
+    assert written[0] == (1, b"2\0")
+
+
+def test_simplify_stream_jsonl():
+    lines = ['"1 + 1"', json.dumps({"id": 7, "source": "x * 2", "bind": ["x=4"]}), "", '{"source": "def ("}', "nope"]
+    writer = io.BytesIO()
+    assert simplify_stream(io.BytesIO("\n".join(lines).encode()), writer, io.BytesIO(), "jsonl", ["x=1"]) == 2
+    results = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert results[:2] == [{"result": "2"}, {"id": 7, "result": "8"}]
+    assert results[2]["error"].startswith("SyntaxError") and results[3]["error"].startswith("JSONDecodeError")
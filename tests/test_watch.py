@@ -0,0 +1,84 @@
+import io
+import sys
+import time
+
+import pytest
+
+from simplify.watch import InotifyBackend, PollingBackend, Watch
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    root = tmp_path / "src"
+    (root / ".hidden").mkdir(parents=True)
+    (root / "a.py").write_text("x = 1\nprint(x + 1)\n")
+    return root
+
+
+class FakeBackend:
+    # each call to `wait` makes the next change and reports the paths it returns
+    def __init__(self, changes):
+        self.changes = list(changes)
+
+    def wait(self, timeout):
+        return self.changes.pop(0)() if self.changes else set()
+
+    def close(self):
+        pass
+
+
+def test_watch(source_tree):
+    path = source_tree / "a.py"
+    out = io.StringIO()
+    messages = []
+    watch = Watch(str(source_tree), out=out, log=messages.append)
+
+    def edit(text):
+        path.write_text(text)
+        return {path}
+
+    # the second write arrives within the debouncing delay and is processed together with the first
+    changes = [lambda: edit("x = 1\nprint(x * 2)\n"), lambda: edit("x = 1\nprint(x + 2)\n"), lambda: set()]
+    watch.run(FakeBackend(changes), max_updates=1)
+    assert out.getvalue() == f"# {path}\nprint(2)\n# {path}\nprint(3)\n"
+    assert messages[-1].endswith("(1 top-level statements reused)")
+
+
+def test_watch_output_dir(source_tree, tmp_path):
+    output_dir = tmp_path / "out"
+    watch = Watch(str(source_tree), output_dir=str(output_dir), log=lambda message: None)
+    watch.update([source_tree / "a.py"])
+    assert (output_dir / "a.py").read_text() == "print(2)\n"
+    (source_tree / "a.py").unlink()
+    watch.update([source_tree / "a.py"])
+    assert not watch.sessions
+
+
+def wait_for(backend, expected):
+    changed = set()
+    deadline = time.monotonic() + 5
+    while changed != expected and time.monotonic() < deadline:
+        changed |= backend.wait(0.1)
+    return changed
+
+
+@pytest.mark.parametrize(
+    "backend_type",
+    [
+        PollingBackend,
+        pytest.param(InotifyBackend, marks=pytest.mark.skipif(sys.platform != "linux", reason="requires inotify")),
+    ],
+)
+def test_backend(source_tree, backend_type):
+    backend = backend_type(source_tree)
+    try:
+        time.sleep(0.01)  # so that modification times differ
+        (source_tree / "a.py").write_text("print(1)\n")
+        (source_tree / "notes.txt").write_text("1 + 1\n")
+        (source_tree / ".hidden" / "b.py").write_text("1 + 1\n")
+        assert wait_for(backend, {source_tree / "a.py"}) == {source_tree / "a.py"}
+        (source_tree / "pkg").mkdir()
+        (source_tree / "pkg" / "c.py").write_text("1 + 1\n")
+        assert wait_for(backend, {source_tree / "pkg" / "c.py"}) == {source_tree / "pkg" / "c.py"}
+    finally:
+        backend.close()